@@ -0,0 +1,152 @@
+"""SQLite database of door status entries and card forwarding outcomes, with a query CLI."""
+import argparse
+import sqlite3
+import time
+from datetime import datetime
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS status_events (
+    id INTEGER PRIMARY KEY,
+    timestamp REAL NOT NULL,
+    reader TEXT NOT NULL,
+    status_code TEXT NOT NULL,
+    status TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS status_events_timestamp ON status_events (timestamp);
+CREATE INDEX IF NOT EXISTS status_events_reader ON status_events (reader, timestamp);
+CREATE INDEX IF NOT EXISTS status_events_code ON status_events (status_code, timestamp);
+
+CREATE TABLE IF NOT EXISTS card_events (
+    id INTEGER PRIMARY KEY,
+    timestamp REAL NOT NULL,
+    reader TEXT,
+    payload TEXT NOT NULL,
+    outcome TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS card_events_timestamp ON card_events (timestamp);
+CREATE INDEX IF NOT EXISTS card_events_reader ON card_events (reader, timestamp);
+"""
+
+class EventDatabase:
+    """Batches rows in memory and writes each batch in one transaction; a LogWriter sink.
+
+    The connection is opened on the first flush, so it belongs to the
+    writer thread; the database runs in WAL mode so queries from other
+    processes do not block it.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.connection = None
+        self.statuses = []
+        self.cards = []
+        self.batches = 0
+
+    def connect(self) -> sqlite3.Connection:
+        if self.connection is None:
+            # close() may run on another thread once the writer thread has stopped
+            self.connection = sqlite3.connect(self.path, check_same_thread=False)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self.connection.executescript(SCHEMA)
+        return self.connection
+
+    def add(self, timestamp: float, status: str, status_code: str, door_name: str):
+        self.statuses.append((timestamp, door_name or "", status_code, status))
+
+    def add_card(self, timestamp: float, payload: str, outcome: str, door_name: str = None):
+        self.cards.append((timestamp, door_name, payload, outcome))
+
+    def flush(self):
+        """Write everything batched so far in a single transaction."""
+        if not self.statuses and not self.cards:
+            return
+        statuses, self.statuses = self.statuses, []
+        cards, self.cards = self.cards, []
+        try:
+            with self.connect() as connection:
+                connection.executemany(
+                    "INSERT INTO status_events (timestamp, reader, status_code, status) VALUES (?, ?, ?, ?)",
+                    statuses)
+                connection.executemany(
+                    "INSERT INTO card_events (timestamp, reader, payload, outcome) VALUES (?, ?, ?, ?)", cards)
+        except sqlite3.Error as e:
+            raise OSError(f"SQLite error: {e}") from e
+        self.batches += 1
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
+
+def import_log(log_path: str, db_path: str) -> int:
+    """Add every status and error line of a text log (or .gz segment) to the database."""
+    from replay import iter_log_entries  # Not at the top, as in event_store: replay imports version10
+
+    db = EventDatabase(db_path)
+    imported = 0
+    try:
+        for timestamp, door_name, status, code in iter_log_entries(log_path):
+            db.add(timestamp, status, code, door_name)
+            imported += 1
+            if len(db.statuses) >= 10000:
+                db.flush()
+    finally:
+        db.close()
+    return imported
+
+def query(db_path: str, table: str, door: str = None, since: float = None, until: float = None,
+          status_code: str = None) -> list:
+    """Rows of status_events or card_events matching the filters, oldest first."""
+    columns = "timestamp, reader, status_code, status" if table == "status_events" else \
+        "timestamp, reader, payload, outcome"
+    conditions = []
+    params = []
+    for condition, value in (("reader = ?", door), ("timestamp >= ?", since), ("timestamp < ?", until),
+                             ("status_code = ?", status_code)):
+        if value is not None:
+            conditions.append(condition)
+            params.append(value)
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+    connection = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        return connection.execute(f"SELECT {columns} FROM {table}{where} ORDER BY timestamp", params).fetchall()
+    finally:
+        connection.close()
+
+def main():
+    from replay import parse_log_time
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+    load = commands.add_parser("import", help="add a text log to the database")
+    load.add_argument("log")
+    load.add_argument("db")
+    show = commands.add_parser("query", help="print status entries, or card outcomes with --cards")
+    show.add_argument("db")
+    show.add_argument("--door", help="only this reader")
+    show.add_argument("--since", type=parse_log_time, help='"YYYY-mm-dd HH:MM:SS"')
+    show.add_argument("--until", type=parse_log_time, help='"YYYY-mm-dd HH:MM:SS"')
+    show.add_argument("--code", help="only this status code, e.g. 81 or ERR")
+    show.add_argument("--cards", action="store_true", help="card forwarding outcomes instead of statuses")
+    args = parser.parse_args()
+
+    if args.command == "import":
+        started = time.perf_counter()
+        imported = import_log(args.log, args.db)
+        print(f"Imported {imported} entries in {time.perf_counter() - started:.2f}s")
+        return
+
+    if args.cards and args.code:
+        parser.error("--code applies to status entries only")
+    table = "card_events" if args.cards else "status_events"
+    for timestamp, reader, code_or_payload, text in query(args.db, table, args.door, args.since, args.until,
+                                                          args.code):
+        when = datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+        print(f"[{when}] [{reader or '-'}] {code_or_payload} {text}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""Fixed-width binary store of door events, read back through mmap."""
+import argparse
+import mmap
+import os
+import struct
+import time
+from datetime import datetime
+
+# timestamp (float64 seconds), reader id, cmd, status code, flags, padding to 16 bytes
+RECORD = struct.Struct("<dHBBB3x")
+
+CMD_LOCK_STATUS = 0x21
+ERROR_CODE = 0xFF      # Status code stored for "ERR" entries
+
+FLAG_ERROR = 0x01      # Entry was an error rather than a status
+FLAG_REPEATED = 0x02   # Entry summarises collapsed repeats of an error
+
+def readers_path(path: str) -> str:
+    """Reader names live next to the store, one per line, line number = reader id."""
+    return path + ".readers"
+
+def unsorted_path(path: str) -> str:
+    """Present once a record was appended out of time order, e.g. by converting an older log."""
+    return path + ".unsorted"
+
+def load_readers(path: str) -> list:
+    try:
+        with open(readers_path(path), encoding="utf-8") as f:
+            return [line.rstrip("\n") for line in f]
+    except FileNotFoundError:
+        return []
+
+class EventStore:
+    """Appends fixed-width event records; also usable as a LogWriter sink."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.readers = load_readers(path)
+        self.reader_ids = {name: index for index, name in enumerate(self.readers)}
+        self.file = open(path, "ab")
+        # Drop a torn record from a crash so every record stays aligned
+        size = self.file.tell()
+        if size % RECORD.size:
+            size -= size % RECORD.size
+            self.file.truncate(size)
+        self.last_timestamp = self._last_timestamp(size)
+        self.appended = 0
+        self.out_of_order = 0
+
+    def _last_timestamp(self, size: int) -> float:
+        if not size:
+            return float("-inf")
+        with open(self.path, "rb") as f:
+            f.seek(size - RECORD.size)
+            return RECORD.unpack(f.read(RECORD.size))[0]
+
+    def reader_id(self, name: str) -> int:
+        reader_id = self.reader_ids.get(name)
+        if reader_id is None:
+            reader_id = self.reader_ids[name] = len(self.readers)
+            self.readers.append(name)
+            with open(readers_path(self.path), "a", encoding="utf-8") as f:
+                f.write(name + "\n")
+        return reader_id
+
+    def append(self, timestamp: float, reader: str, cmd: int, status_code: int, flags: int = 0):
+        if timestamp < self.last_timestamp:
+            if not self.out_of_order:
+                # Readers can no longer binary search by time
+                open(unsorted_path(self.path), "a").close()
+            self.out_of_order += 1
+        else:
+            self.last_timestamp = timestamp
+        self.file.write(RECORD.pack(timestamp, self.reader_id(reader), cmd, status_code, flags))
+        self.appended += 1
+
+    def add(self, timestamp: float, status: str, status_code: str, door_name: str):
+        """Record a text log entry."""
+        if status_code == "ERR":
+            code = ERROR_CODE
+            flags = FLAG_ERROR | (FLAG_REPEATED if " (repeated " in status else 0)
+        else:
+            try:
+                code = int(status_code, 16)
+            except ValueError:
+                return
+            flags = 0
+        self.append(timestamp, door_name or "", CMD_LOCK_STATUS, code, flags)
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+class EventView:
+    """Read-only, memory-mapped view of an event store, in append order."""
+
+    def __init__(self, path: str):
+        self.readers = load_readers(path)
+        self.sorted = not os.path.exists(unsorted_path(path))  # Append order is also time order
+        self.file = open(path, "rb")
+        self.count = os.fstat(self.file.fileno()).st_size // RECORD.size
+        # An empty file cannot be mapped
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if self.count else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def record(self, index: int) -> tuple:
+        return RECORD.unpack_from(self.map, index * RECORD.size)
+
+    def __iter__(self):
+        if self.map:
+            yield from RECORD.iter_unpack(memoryview(self.map)[:self.count * RECORD.size])
+
+    def reader_name(self, reader_id: int) -> str:
+        return self.readers[reader_id] if reader_id < len(self.readers) else f"#{reader_id}"
+
+    def _first_at(self, timestamp: float) -> int:
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.record(middle)[0] < timestamp:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def between(self, start: float = None, end: float = None):
+        """Yield records with start <= timestamp < end, by binary search while the store is in time order."""
+        if not self.sorted:
+            for record in self:
+                if (start is None or record[0] >= start) and (end is None or record[0] < end):
+                    yield record
+            return
+        first = self._first_at(start) if start is not None else 0
+        last = self._first_at(end) if end is not None else self.count
+        for index in range(first, last):
+            yield self.record(index)
+
+    def close(self):
+        if self.map:
+            self.map.close()
+        self.file.close()
+
+def convert_log(log_path: str, store_path: str) -> int:
+    """Append every status and error line of a text log (or .gz segment) to a store."""
+    # Local import: replay imports version10, and version10 imports this module for its sink
+    from replay import iter_log_entries
+
+    store = EventStore(store_path)
+    try:
+        for timestamp, door_name, status, code in iter_log_entries(log_path):
+            store.add(timestamp, status, code, door_name)
+    finally:
+        store.close()
+    return store.appended
+
+def format_record(view: EventView, record: tuple) -> str:
+    timestamp, reader_id, cmd, code, flags = record
+    when = datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+    status = "ERR" if flags & FLAG_ERROR else f"{code:02X}"
+    repeated = " repeated" if flags & FLAG_REPEATED else ""
+    return f"[{when}] [{view.reader_name(reader_id)}] cmd {cmd:02X} code {status}{repeated}"
+
+def main():
+    from replay import parse_log_time
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+    convert = commands.add_parser("convert", help="append a text log to an event store")
+    convert.add_argument("log")
+    convert.add_argument("store")
+    show = commands.add_parser("show", help="print events from an event store")
+    show.add_argument("store")
+    show.add_argument("--door", help="only this reader")
+    show.add_argument("--since", type=parse_log_time, help='"YYYY-mm-dd HH:MM:SS"')
+    show.add_argument("--until", type=parse_log_time, help='"YYYY-mm-dd HH:MM:SS"')
+    show.add_argument("--count", action="store_true", help="print only the number of matching events")
+    args = parser.parse_args()
+
+    if args.command == "convert":
+        started = time.perf_counter()
+        converted = convert_log(args.log, args.store)
+        print(f"Converted {converted} entries in {time.perf_counter() - started:.2f}s: "
+              f"{os.path.getsize(args.log)} bytes of text, {os.path.getsize(args.store)} bytes stored")
+        if os.path.exists(unsorted_path(args.store)):
+            print("Warning: the store is no longer in time order, so --since/--until scan every event")
+        return
+
+    with EventView(args.store) as view:
+        door_id = view.readers.index(args.door) if args.door in view.readers else None
+        if args.door and door_id is None:
+            return
+        started = time.perf_counter()
+        matches = 0
+        for record in view.between(args.since, args.until):
+            if door_id is not None and record[1] != door_id:
+                continue
+            matches += 1
+            if not args.count:
+                print(format_record(view, record))
+        if args.count:
+            print(f"{matches} of {len(view)} events in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
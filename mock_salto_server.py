@@ -0,0 +1,203 @@
+"""Stand-in SALTO server and a load generator for the card forwarding path."""
+import argparse
+import asyncio
+import itertools
+import random
+import threading
+import time
+
+import version10
+from version10 import LatencyStats, PayloadForwarder, SaltoEndpoints
+
+ACK = b'\x06'
+NAK = b'\x15'
+
+def frame_reply(reply: bytes) -> bytes:
+    """Frame a reply the way the forwarder expects to read it."""
+    if version10.SALTO_REPLY_FRAMING == "length":
+        return len(reply).to_bytes(2, "big") + reply
+    if version10.SALTO_REPLY_FRAMING == "delimiter":
+        return reply + version10.SALTO_REPLY_DELIMITER
+    return reply
+
+class MockSaltoServer:
+    """Accepts card payloads and answers ACK, NAK or nothing, after a configurable delay."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = version10.SALTO_SERVER_PORT, latency: float = 0.0,
+                 jitter: float = 0.0, error_rate: float = 0.0, drop_rate: float = 0.0, seed: int = None):
+        self.host = host
+        self.port = port
+        self.latency = latency        # Seconds before each reply
+        self.jitter = jitter          # Extra random delay, up to this many seconds
+        self.error_rate = error_rate  # Chance of answering NAK
+        self.drop_rate = drop_rate    # Chance of closing the connection instead of answering
+        self.random = random.Random(seed)
+        self.server = None
+
+        self.connections = 0
+        self.requests = 0
+        self.errors = 0
+        self.drops = 0
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            while True:
+                # Payloads are sent unframed, so each read is taken as one request
+                data = await reader.read(4096)
+                if not data:
+                    return
+                self.requests += 1
+                delay = self.latency + self.random.uniform(0, self.jitter)
+                if delay:
+                    await asyncio.sleep(delay)
+                if self.random.random() < self.drop_rate:
+                    self.drops += 1
+                    return
+                if self.random.random() < self.error_rate:
+                    self.errors += 1
+                    writer.write(frame_reply(NAK))
+                else:
+                    writer.write(frame_reply(ACK))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        await self.start()
+        print(f"Mock SALTO server listening on {self.host}:{self.port}")
+        async with self.server:
+            await self.server.serve_forever()
+
+    def start_in_thread(self):
+        """Run the server on its own event loop in a daemon thread; returns once it is listening."""
+        started = threading.Event()
+
+        def run():
+            loop = asyncio.new_event_loop()
+            loop.run_until_complete(self.start())
+            started.set()
+            loop.run_forever()
+
+        threading.Thread(target=run, name="mock-salto-server", daemon=True).start()
+        started.wait()
+        return self
+
+def run_load(host: str, port: int, readers: int, rate: float, duration: float, workers: int, queue_size: int):
+    """Simulate readers swiping cards into a PayloadForwarder and report throughput and latency.
+
+    Latency is measured from the swipe being queued to its reply arriving,
+    so it includes time spent waiting in the forward queue.
+    """
+    version10.salto_servers = SaltoEndpoints([(host, port)])
+    for pool in version10.salto_servers.pools:
+        pool.size = workers
+    latency = LatencyStats(samples=1_000_000)
+    queued_at = {}
+    failures = [0]
+    lock = threading.Lock()
+
+    def send(payload: str) -> bool:
+        try:
+            reply = version10.deliver_payload(payload)
+        except (OSError, ValueError):
+            with lock:
+                failures[0] += 1
+                queued_at.pop(payload, None)
+            return False
+        with lock:
+            latency.record(time.perf_counter() - queued_at.pop(payload))
+            if not reply.startswith(ACK):
+                failures[0] += 1
+        return True
+
+    forwarder = PayloadForwarder(send, maxsize=queue_size, workers=workers, overflow="drop_newest")
+    forwarder.start()
+    swipe_ids = itertools.count()
+    stop_at = time.monotonic() + duration
+
+    def reader_loop(reader_id: int):
+        interval = 1.0 / rate
+        next_swipe = time.monotonic() + random.uniform(0, interval)
+        while True:
+            now = time.monotonic()
+            if now >= stop_at:
+                return
+            if now < next_swipe:
+                time.sleep(min(next_swipe - now, stop_at - now))
+                continue
+            # Every swipe gets a distinct 36-byte payload
+            payload = f"{reader_id:08X}{next(swipe_ids):064X}"
+            with lock:
+                queued_at[payload] = time.perf_counter()
+            if not forwarder.submit(payload):
+                with lock:
+                    queued_at.pop(payload, None)
+            next_swipe += interval
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=reader_loop, args=(i,), daemon=True) for i in range(readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    forwarder.stop(timeout=30)
+    elapsed = time.perf_counter() - started
+    version10.salto_servers.close()
+
+    summary = latency.summary()
+    ordered = sorted(latency.samples)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] if ordered else 0.0
+    stats = forwarder.stats()
+    print(f"Readers: {readers} at {rate} swipes/s each for {duration}s, {workers} forwarder workers")
+    print(f"Swipes: {stats['enqueued']} queued, {summary['count']} answered, {failures[0]} failed, "
+          f"{stats['dropped']} dropped (max queue depth {stats['max_depth']})")
+    print(f"Throughput: {summary['count'] / elapsed:.0f} swipes/s")
+    print(f"Latency: p50 {summary['p50'] * 1000:.2f} ms, p95 {summary['p95'] * 1000:.2f} ms, "
+          f"p99 {p99 * 1000:.2f} ms, max {summary['max'] * 1000:.2f} ms")
+    print(f"Connections opened: {version10.salto_servers.connects}, reused: {version10.salto_servers.reuses}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("mode", choices=["serve", "load"], help="run the mock server, or a load test against it")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=version10.SALTO_SERVER_PORT)
+    parser.add_argument("--latency", type=float, default=0.0, help="server delay before each reply, seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random server delay, seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="chance the server answers NAK")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="chance the server drops the connection")
+    parser.add_argument("--external", action="store_true",
+                        help="load test a server already running at --host/--port instead of an in-process mock")
+    parser.add_argument("--readers", type=int, default=50, help="simulated card readers")
+    parser.add_argument("--rate", type=float, default=2.0, help="swipes per second per reader")
+    parser.add_argument("--duration", type=float, default=10.0, help="load test length, seconds")
+    parser.add_argument("--workers", type=int, default=version10.FORWARD_WORKERS, help="forwarder workers")
+    parser.add_argument("--queue-size", type=int, default=version10.FORWARD_QUEUE_SIZE)
+    args = parser.parse_args()
+
+    server = MockSaltoServer(args.host, args.port, args.latency, args.jitter, args.error_rate, args.drop_rate)
+    if args.mode == "serve":
+        try:
+            asyncio.run(server.serve_forever())
+        except KeyboardInterrupt:
+            pass
+        return
+
+    version10.console.quiet = True  # The forwarding path prints every payload
+    if not args.external:
+        server.port = 0  # Any free port
+        server.start_in_thread()
+    run_load(args.host, server.port, args.readers, args.rate, args.duration, args.workers, args.queue_size)
+    if not args.external:
+        print(f"Server: {server.requests} requests on {server.connections} connections, "
+              f"{server.errors} NAKs, {server.drops} dropped connections")
+
+if __name__ == "__main__":
+    main()
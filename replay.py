@@ -0,0 +1,137 @@
+"""Replay a door status log or a raw serial capture through the frame pipeline."""
+import argparse
+import gzip
+import re
+import time
+from datetime import datetime
+
+from version10 import (
+    CMD_LOCK_STATUS, DoorReader, FrameDeframer, SerialSession, build_frame, console, process_responses,
+)
+
+LOG_LINE = re.compile(
+    r"^\[(?P<timestamp>\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\](?: \[(?P<door>[^\]]+)\])?"
+    r" Status: (?P<status>.*) \(Code: (?P<code>[^)]*)\)$"
+)
+# Error entries that kept the raw bytes received from the lock
+RAW_ERROR = re.compile(r"(?:Invalid frame received|Received invalid data|Invalid protocol detected): ([0-9A-Fa-f]+)$")
+STATUS_CODE = re.compile(r"^[0-9A-Fa-f]{2}$")
+
+DEFAULT_DOOR = "door-1"
+LOG_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+def parse_log_time(text: str) -> float:
+    """Timestamp of a log line's "YYYY-mm-dd HH:MM:SS" time, in local time."""
+    return datetime.strptime(text, LOG_TIME_FORMAT).timestamp()
+
+def iter_log_entries(path: str):
+    """Yield (timestamp, door name, status, code) for every entry of a text log or rotated .gz segment.
+
+    Lines from single-door logs carry no door tag and are given DEFAULT_DOOR.
+    """
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            match = LOG_LINE.match(line.rstrip("\n"))
+            if match:
+                yield (parse_log_time(match.group("timestamp")), match.group("door") or DEFAULT_DOOR,
+                       match.group("status"), match.group("code"))
+
+def iter_log_events(path: str):
+    """Yield (timestamp, door name, raw bytes) for every replayable line of a text log.
+
+    Status lines are turned back into the status frame the lock sent, and
+    error lines that recorded raw data replay those exact bytes.
+    """
+    for timestamp, door_name, status, code in iter_log_entries(path):
+        if STATUS_CODE.match(code):
+            data = build_frame(0x00, 0x01, CMD_LOCK_STATUS, code.upper())
+        elif code == "ERR":
+            raw = RAW_ERROR.search(status)
+            if not raw or len(raw.group(1)) % 2:
+                continue
+            data = bytes.fromhex(raw.group(1))
+        else:
+            continue
+        yield timestamp, door_name, data
+
+def iter_capture_events(path: str, chunk_size: int = 64):
+    """Yield the bytes of a raw serial capture in read-sized chunks, without timing."""
+    with open(path, "rb") as f:
+        while True:
+            data = f.read(chunk_size)
+            if not data:
+                return
+            yield None, DEFAULT_DOOR, data
+
+def ignore_checksum_error(response: bytes, door: DoorReader):
+    """Bad frames are only counted on the door, not logged again."""
+
+def replay(events, speed: float = 1.0, forward=None, on_change=None) -> dict:
+    """Feed events through deframing, parsing and state tracking.
+
+    speed scales the original timing (10 = ten times faster); 0 replays as
+    fast as possible. Card payloads go to forward(payload, door name),
+    status changes to on_change(door, result). Returns counters for the run.
+    """
+    doors = {}
+    deframers = {}
+    stats = {"events": 0, "frames": 0, "changes": 0, "cards": 0}
+    forward = forward or (lambda payload, reader: None)
+
+    first_timestamp = None
+    started = time.perf_counter()
+    for timestamp, door_name, data in events:
+        if speed and timestamp is not None:
+            if first_timestamp is None:
+                first_timestamp = timestamp
+            wait = started + (timestamp - first_timestamp) / speed - time.perf_counter()
+            if wait > 0:
+                time.sleep(wait)
+
+        door = doors.get(door_name)
+        if door is None:
+            # The session is never opened, it only carries the per-door state
+            door = doors[door_name] = DoorReader(door_name, SerialSession(door_name))
+            deframers[door_name] = FrameDeframer()
+
+        frames = deframers[door_name].feed(data)
+        stats["events"] += 1
+        stats["frames"] += len(frames)
+        # Repeats are judged on the recorded time, so the count does not depend on the speed
+        result = process_responses(frames, forward=forward, door=door, on_checksum_error=ignore_checksum_error,
+                                   now=timestamp)
+        if result.status_changed:
+            stats["changes"] += 1
+            if on_change:
+                on_change(door, result)
+
+    stats["elapsed"] = time.perf_counter() - started
+    stats["cards"] = sum(door.card_reads for door in doors.values())
+    stats["duplicates"] = sum(door.duplicate_cards for door in doors.values())
+    stats["checksum_errors"] = sum(door.checksum_errors for door in doors.values())
+    return stats
+
+def print_change(door: DoorReader, result):
+    console.print(f"[cyan]{door.name}[/] {result.current_status} [yellow](Code: {result.status_code})[/]")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path", help="door status log or rotated .gz segment, or raw capture with --raw")
+    parser.add_argument("--raw", action="store_true", help="path is a raw serial capture")
+    parser.add_argument("--speed", type=float, default=0.0,
+                        help="timing scale: 1 = original timing, 10 = 10x faster, 0 = as fast as possible")
+    parser.add_argument("--print", action="store_true", help="print every status change")
+    args = parser.parse_args()
+
+    events = iter_capture_events(args.path) if args.raw else iter_log_events(args.path)
+    stats = replay(events, args.speed, on_change=print_change if args.print else None)
+
+    elapsed = stats["elapsed"]
+    print(f"Replayed {stats['events']} events ({stats['frames']} frames) in {elapsed:.2f}s "
+          f"({stats['events'] / elapsed if elapsed else 0:.0f} events/s)")
+    print(f"Status changes: {stats['changes']}, cards: {stats['cards']} ({stats['duplicates']} repeated), "
+          f"checksum errors: {stats['checksum_errors']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""Simulated Salto lock on a pseudo-terminal, for running the monitor without a reader."""
+import argparse
+import os
+import random
+import statistics
+import threading
+import time
+import tty
+
+import version10
+from mock_salto_server import MockSaltoServer
+from version10 import (
+    CMD_CARD_DATA, CMD_LOCK_STATUS, DoorReader, Frame, FrameDeframer, SerialSession,
+    build_frame, send_command, send_commands, verify_frame,
+)
+
+STATUS_CODES = ["80", "81", "82", "83"]
+
+# Card payload from the dummy response in test.py
+CARD_SEQ = 0x65
+CARD_PAYLOAD = "000000003252E987EB51992DF11669216C59C7C3A8777338309D7D26BA3BF00FC29F49C3"
+
+class SimulatedLock:
+    """Answers status requests on a pty like a lock on COM5 would."""
+
+    def __init__(self, change_every: int = 50, card_every: int = 0, noise: float = 0.0,
+                 split: float = 0.0, delay: float = 0.0, seed: int = None):
+        self.master, self.slave = os.openpty()
+        tty.setraw(self.slave)
+        self.port = os.ttyname(self.slave)
+
+        self.change_every = change_every  # Requests between status changes, 0 = never
+        self.card_every = card_every      # Requests between card swipes, 0 = never
+        self.noise = noise                # Chance of garbage before a reply
+        self.split = split                # Chance of a reply arriving in two writes
+        self.delay = delay                # Seconds before each reply
+        self.random = random.Random(seed)
+
+        self.deframer = FrameDeframer()
+        self.status_index = 0
+        self.requests = 0
+        self.cards_sent = 0
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.running = False
+        os.close(self.master)
+        os.close(self.slave)
+
+    def run(self):
+        while self.running:
+            try:
+                data = os.read(self.master, 4096)
+            except OSError:
+                return
+            for raw in self.deframer.feed(data):
+                if not verify_frame(raw):
+                    continue
+                request = Frame(raw)
+                if request.cmd == CMD_LOCK_STATUS:
+                    self.answer_status(request)
+
+    def answer_status(self, request: Frame):
+        """Reply to a status request, changing status and swiping cards on schedule."""
+        self.requests += 1
+        if self.change_every and self.requests % self.change_every == 0:
+            self.status_index = (self.status_index + 1) % len(STATUS_CODES)
+
+        reply = build_frame(0x00, request.seq, CMD_LOCK_STATUS, STATUS_CODES[self.status_index])
+        if self.card_every and self.requests % self.card_every == 0:
+            reply += build_frame(0x00, CARD_SEQ, CMD_CARD_DATA, CARD_PAYLOAD)
+            self.cards_sent += 1
+        if self.noise and self.random.random() < self.noise:
+            reply = bytes(self.random.randrange(0x20, 0x7F) for _ in range(self.random.randint(1, 8))) + reply
+        self.send(reply)
+
+    def send(self, data: bytes):
+        if self.delay:
+            time.sleep(self.delay)
+        try:
+            if self.split and self.random.random() < self.split:
+                cut = self.random.randint(1, len(data) - 1)
+                os.write(self.master, data[:cut])
+                time.sleep(0.002)
+                os.write(self.master, data[cut:])
+            else:
+                os.write(self.master, data)
+        except OSError:
+            self.running = False
+
+def benchmark(lock: SimulatedLock, polls: int):
+    """Drive send_command() against the simulated lock and print throughput and latency."""
+    door = DoorReader("sim", SerialSession(lock.port))
+    latencies = []
+    changes = 0
+    started = time.perf_counter()
+    for _ in range(polls):
+        poll_started = time.perf_counter()
+        result = send_command(door)
+        latencies.append(time.perf_counter() - poll_started)
+        changes += result.status_changed
+    elapsed = time.perf_counter() - started
+    door.session.close()
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(f"Polls: {polls} in {elapsed:.2f}s ({polls / elapsed:.0f} polls/s)")
+    print(f"Poll latency: p50 {quantiles[49] * 1000:.2f} ms, p99 {quantiles[98] * 1000:.2f} ms, "
+          f"max {max(latencies) * 1000:.2f} ms")
+    print(f"Write latency: avg {door.session.average_write_latency * 1000:.3f} ms, "
+          f"max {door.session.max_write_latency * 1000:.3f} ms")
+    print(f"Status changes: {changes}, cards: {door.card_reads}/{lock.cards_sent} "
+          f"({door.duplicate_cards} repeated), "
+          f"checksum errors: {door.checksum_errors}, discarded bytes: {door.session.deframer.discarded_bytes}")
+
+def benchmark_pipeline(lock: SimulatedLock, polls: int, depth: int):
+    """Drive send_commands() with depth status requests in flight and print throughput."""
+    door = DoorReader("sim", SerialSession(lock.port))
+    changes = [0]
+
+    def on_status(result, door):
+        changes[0] += 1
+
+    started = time.perf_counter()
+    replies = send_commands(door, [(CMD_LOCK_STATUS, "00")] * polls, depth, on_status)
+    elapsed = time.perf_counter() - started
+    door.session.close()
+
+    print(f"Pipelined polls: {polls} at depth {depth} in {elapsed:.2f}s ({polls / elapsed:.0f} polls/s), "
+          f"{replies.count(None)} unanswered")
+    print(f"Status changes: {changes[0]}, cards: {door.card_reads}/{lock.cards_sent}, "
+          f"checksum errors: {door.checksum_errors}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--bench", type=int, metavar="POLLS", help="benchmark send_command() for POLLS polls")
+    parser.add_argument("--pipeline", type=int, metavar="DEPTH",
+                        help="with --bench, keep DEPTH requests in flight using send_commands()")
+    parser.add_argument("--monitor", action="store_true", help="run the door monitor against the simulated lock")
+    parser.add_argument("--change-every", type=int, default=50, help="requests between status changes")
+    parser.add_argument("--card-every", type=int, default=0, help="requests between card swipes")
+    parser.add_argument("--noise", type=float, default=0.0, help="chance of garbage before a reply")
+    parser.add_argument("--split", type=float, default=0.0, help="chance of a reply being split in two writes")
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds before each reply")
+    parser.add_argument("--seed", type=int, help="random seed for noise and splits")
+    args = parser.parse_args()
+
+    lock = SimulatedLock(args.change_every, args.card_every, args.noise, args.split, args.delay, args.seed).start()
+    print(f"Simulated lock listening on {lock.port}")
+    # Card payloads go to a local mock, never to the configured SALTO servers
+    server = MockSaltoServer(port=0).start_in_thread()
+    version10.salto_servers = version10.SaltoEndpoints([(server.host, server.port)])
+    print(f"Card payloads forwarded to a mock SALTO server on {server.host}:{server.port}")
+    try:
+        if args.bench and args.pipeline:
+            benchmark_pipeline(lock, args.bench, args.pipeline)
+        elif args.bench:
+            benchmark(lock, args.bench)
+        elif args.monitor:
+            version10.readers.clear()
+            version10.register_reader("sim", lock.port)
+            version10.continuous_check()
+        else:
+            while True:
+                time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        lock.stop()
+
+if __name__ == "__main__":
+    main()
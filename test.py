@@ -1,13 +1,19 @@
 # Testing dummy payload
 
+from version10 import FrameDeframer
 
 response = b'\x02000121815E\r\x02006505000000003252E987EB51992DF11669216C59C7C3A8777338309D7D26BA3BF00FC29F49C3CA\r'
 print(f"Raw response: {response}")
 
+deframer = FrameDeframer()
+frames = deframer.feed(response)
 
-if response.startswith(b'\x02') and response.endswith(b'\r'):
+if not frames:
+    print("Invalid response format (missing STX or CR).")
+
+for frame in frames:
 
-    clean_response = response[13:-1].decode('utf-8', errors='ignore')
+    clean_response = frame[1:-1].decode('ascii', errors='ignore')
 
     print(clean_response)
 
@@ -20,5 +26,3 @@ if response.startswith(b'\x02') and response.endswith(b'\r'):
         print(f"Payload: {payload}")
     else:
         print("The sequence at positions 5 and 6 is not '05'. Skipping payload send.")
-else:
-    print("Invalid response format (missing STX or CR).")
@@ -1,19 +1,632 @@
 import serial
 import time
 import os
+import sys
+import re
+import random
+import string
+import asyncio
+import functools
 from datetime import datetime
 from rich.console import Console
 from rich.panel import Panel
 from rich.align import Align
 import socket  # TCP socket for Salto server
+import select
+import io
+import threading
+import queue
+from collections import OrderedDict, deque
+import itertools
+import statistics
+import glob
+import gzip
+import shutil
 
 console = Console()
-last_status = None
 LOG_FILE = "door_status_log.txt"
+LOG_QUEUE_SIZE = 10000        # Entries waiting for the writer before new ones are dropped
+LOG_FLUSH_BYTES = 64 * 1024   # Buffered entries written once they reach this size
+LOG_FLUSH_INTERVAL = 1.0      # Seconds before buffered entries are written anyway
+LOG_ROTATE = "size"           # "size", "daily" or None to never rotate
+LOG_MAX_BYTES = 1024 * 1024   # Segment size that triggers rotation with "size"
+LOG_BACKUPS = 14              # Compressed segments kept, oldest deleted first
+LOG_REPEAT_WINDOW = 10.0      # Seconds without an error before its repeats are summarised
+LOG_REPEAT_SUMMARY = 60.0     # Seconds between "repeated N times" entries during a long burst
+EVENT_STORE_FILE = None       # Also append entries to this binary event store (see event_store.py)
+EVENT_DB_FILE = None          # Also record entries and card outcomes in this SQLite database (see event_db.py)
 
 # TCP SALTO Server Configuration
 SALTO_SERVER_IP = "10.57.0.95"
 SALTO_SERVER_PORT = 8090
+SALTO_SERVERS = [  # Tried in this order with "failover" balancing
+    (SALTO_SERVER_IP, SALTO_SERVER_PORT),
+]
+SALTO_BALANCING = "failover"  # "failover", "round_robin" or "least_outstanding"
+SALTO_HEALTH_INTERVAL = 5.0   # Seconds between reconnect probes of failed servers
+SALTO_CONNECT_TIMEOUT = 2  # Seconds to establish a connection
+SALTO_IO_TIMEOUT = 2       # Seconds to wait on a send or reply
+SALTO_POOL_SIZE = 2        # Idle connections kept open
+SALTO_IDLE_TIMEOUT = 60    # Seconds before an idle connection is dropped
+SALTO_REPLY_FRAMING = "delimiter"  # "delimiter": reply ends with SALTO_REPLY_DELIMITER,
+                                   # "length": reply starts with a 2-byte big-endian length,
+                                   # "first_read": legacy opt-out for a server that frames neither way;
+                                   # the reply is whatever the first read returns, so a partial one is not noticed
+SALTO_REPLY_DELIMITER = b'\r'
+SALTO_RTT_SAMPLES = 1000   # Round-trip times kept for the latency summary
+
+# Card payload forwarding queue
+FORWARD_QUEUE_SIZE = 100
+FORWARD_WORKERS = 2
+FORWARD_OVERFLOW = "drop_oldest"  # "drop_oldest", "drop_newest" or "block"
+FORWARD_BLOCK_TIMEOUT = 0.05      # Longest a poll may wait for room with "block"
+
+# Suppression of a card payload repeated while the card is held on the reader
+DEDUP_WINDOW = 3.0          # Seconds without the payload before it counts as a new swipe
+DEDUP_MAX_ENTRIES = 1024
+
+# Outbox for payloads that could not be delivered
+OUTBOX_FILE = "salto_outbox.log"
+OUTBOX_MAX_BYTES = 4 * 1024 * 1024
+OUTBOX_FSYNC_BATCH = 16       # Records written before an fsync
+OUTBOX_FSYNC_INTERVAL = 1.0   # Seconds before unsynced records are fsynced anyway
+OUTBOX_COMPACT_MIN = 256      # Delivered records in the file before compaction is considered
+OUTBOX_RETRY_INTERVAL = 5.0   # Seconds between delivery attempts while the server is down
+
+# Serial Reader Configuration
+SERIAL_PORT = 'COM5'
+SERIAL_BAUDRATE = 115200
+SERIAL_TIMEOUT = 0.1
+SERIAL_WRITE_TIMEOUT = 0.5  # Deadline for a frame to leave the driver
+
+# Frame delimiters
+STX = b'\x02'
+CR = b'\r'
+MAX_FRAME_LENGTH = 512
+
+class FrameDeframer:
+    """Incremental STX...CR deframer that keeps partial frames between reads."""
+
+    def __init__(self, max_frame_length: int = MAX_FRAME_LENGTH):
+        self.buffer = bytearray()
+        self.max_frame_length = max_frame_length
+        self.discarded_bytes = 0
+
+    def feed(self, data: bytes) -> list:
+        """Add received bytes and return every complete frame, STX and CR included."""
+        buf = self.buffer
+        buf += data
+        frames = []
+        pos = 0
+        while pos < len(buf):
+            start = buf.find(STX, pos)
+            if start < 0:
+                # Garbage with no frame start, nothing worth keeping
+                self.discarded_bytes += len(buf) - pos
+                pos = len(buf)
+                break
+            self.discarded_bytes += start - pos
+
+            end = buf.find(CR, start + 1)
+            restart = buf.find(STX, start + 1, end if end >= 0 else len(buf))
+            if restart >= 0:
+                # A new STX before the CR means this frame was cut short, resync on it
+                self.discarded_bytes += restart - start
+                pos = restart
+                continue
+
+            if end < 0:
+                if len(buf) - start > self.max_frame_length:
+                    self.discarded_bytes += len(buf) - start
+                    pos = len(buf)
+                else:
+                    pos = start  # Partial tail, wait for the rest
+                break
+
+            frames.append(bytes(buf[start:end + 1]))
+            pos = end + 1
+
+        del buf[:pos]
+        return frames
+
+    def reset(self):
+        """Drop any buffered partial frame."""
+        self.buffer.clear()
+
+# Port open retry policy
+OPEN_FAILURE_THRESHOLD = 3   # Failed opens before the breaker trips
+OPEN_BACKOFF_INITIAL = 1.0   # Seconds before the first retry once tripped
+OPEN_BACKOFF_MAX = 60.0
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker with exponential backoff and jitter between retries."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold: int = OPEN_FAILURE_THRESHOLD,
+                 initial_backoff: float = OPEN_BACKOFF_INITIAL, max_backoff: float = OPEN_BACKOFF_MAX):
+        self.failure_threshold = failure_threshold
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.state = self.CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.retry_at = 0.0
+
+    def allow(self, now: float = None) -> bool:
+        """Whether an attempt may be made now; an open breaker goes half-open once its backoff ends."""
+        now = time.monotonic() if now is None else now
+        if self.state == self.OPEN and now >= self.retry_at:
+            self.state = self.HALF_OPEN
+        return self.state != self.OPEN
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.failures = 0
+        self.trips = 0
+
+    def record_failure(self, now: float = None):
+        now = time.monotonic() if now is None else now
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            backoff = min(self.initial_backoff * 2 ** self.trips, self.max_backoff)
+            self.trips += 1
+            self.state = self.OPEN
+            self.retry_at = now + random.uniform(backoff / 2, backoff)
+
+    def retry_in(self, now: float = None) -> float:
+        """Seconds until the next attempt is allowed."""
+        now = time.monotonic() if now is None else now
+        return max(0.0, self.retry_at - now) if self.state == self.OPEN else 0.0
+
+class SerialSession:
+    """Long-lived serial connection that is reopened only after a failure."""
+
+    def __init__(self, port: str = SERIAL_PORT, baudrate: int = SERIAL_BAUDRATE, timeout: float = SERIAL_TIMEOUT,
+                 write_timeout: float = SERIAL_WRITE_TIMEOUT):
+        self.port = port
+        self.baudrate = baudrate
+        self.timeout = timeout
+        self.write_timeout = write_timeout
+        self.ser = None
+        self.deframer = FrameDeframer()
+        self.breaker = CircuitBreaker()
+
+        # Write latency statistics, in seconds
+        self.last_write_latency = 0.0
+        self.max_write_latency = 0.0
+        self.total_write_latency = 0.0
+        self.write_count = 0
+
+    @property
+    def is_open(self):
+        return self.ser is not None and self.ser.is_open
+
+    def open(self):
+        """Open the port if it is not open yet and return the Serial object."""
+        if not self.is_open:
+            if not self.breaker.allow():
+                raise serial.SerialException(f"port {self.port} unavailable, not retrying yet")
+            try:
+                self.ser = serial.Serial(self.port, self.baudrate, timeout=self.timeout,
+                                         write_timeout=self.write_timeout)
+            except (serial.SerialException, OSError):
+                self.breaker.record_failure()
+                raise
+            self.breaker.record_success()
+        return self.ser
+
+    def close(self):
+        """Close the port; the next open() reconnects."""
+        if self.ser is not None:
+            try:
+                self.ser.close()
+            except (serial.SerialException, OSError):
+                pass
+            self.ser = None
+        self.deframer.reset()
+
+    @property
+    def average_write_latency(self):
+        return self.total_write_latency / self.write_count if self.write_count else 0.0
+
+    def write_frame(self, frame: bytes) -> float:
+        """Write a frame, wait for it to drain and return the write latency in seconds."""
+        ser = self.open()
+        started = time.perf_counter()
+        # write() gives up after write_timeout; flush() sleeps in tcdrain until
+        # the driver has sent everything instead of spinning on out_waiting.
+        ser.write(frame)
+        ser.flush()
+        latency = time.perf_counter() - started
+
+        self.last_write_latency = latency
+        self.max_write_latency = max(self.max_write_latency, latency)
+        self.total_write_latency += latency
+        self.write_count += 1
+        return latency
+
+    def read_frames(self, deadline: float = None) -> list:
+        """Read until at least one complete frame arrives or the read times out.
+
+        A line that keeps sending garbage or partial frames is given up on
+        after the read timeout too, instead of holding the poll loop. With a
+        monotonic deadline that has already passed, only bytes that are
+        already waiting are read.
+        """
+        ser = self.open()
+        deadline = time.monotonic() + self.timeout if deadline is None else deadline
+        while True:
+            waiting = ser.in_waiting
+            if not waiting and time.monotonic() >= deadline:
+                return []
+            chunk = ser.read(waiting or 1)
+            if not chunk:
+                return []
+            frames = self.deframer.feed(chunk)
+            if frames:
+                return frames
+            if time.monotonic() >= deadline:
+                return []
+
+    def transact(self, frame: bytes) -> list:
+        """Write a frame and return the frames read back, dropping the port on failure."""
+        try:
+            self.write_frame(frame)
+            return self.read_frames()
+        except (serial.SerialException, OSError):
+            self.close()
+            raise
+
+# Poll scheduling: fast right after activity, slower while the door is stable
+POLL_MIN_INTERVAL = 0.05
+POLL_MAX_INTERVAL = 0.5
+POLL_BACKOFF_FACTOR = 1.5
+
+class PollScheduler:
+    """Adaptive poll interval that resets on activity and backs off while idle."""
+
+    def __init__(self, min_interval: float = POLL_MIN_INTERVAL, max_interval: float = POLL_MAX_INTERVAL,
+                 backoff_factor: float = POLL_BACKOFF_FACTOR):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff_factor = backoff_factor
+        self.interval = min_interval
+        self.next_poll = 0.0
+
+    def record(self, activity: bool, now: float = None):
+        """Schedule the next poll after a poll that did or did not see activity."""
+        now = time.monotonic() if now is None else now
+        if activity:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.interval * self.backoff_factor, self.max_interval)
+        self.next_poll = now + self.interval
+
+    def defer(self, delay: float, now: float = None):
+        """Push the next poll back by at least delay seconds."""
+        now = time.monotonic() if now is None else now
+        self.next_poll = max(self.next_poll, now + delay)
+
+    def is_due(self, now: float = None) -> bool:
+        now = time.monotonic() if now is None else now
+        return now >= self.next_poll
+
+    def delay(self, now: float = None) -> float:
+        """Seconds left until the next poll is due."""
+        now = time.monotonic() if now is None else now
+        return max(0.0, self.next_poll - now)
+
+class DoorReader:
+    """A door reader with its own serial session, poll schedule and last reported status."""
+
+    def __init__(self, name: str, session: SerialSession, scheduler: PollScheduler = None):
+        self.name = name
+        self.session = session
+        self.scheduler = scheduler or PollScheduler()
+        self.last_status = None
+        self.card_reads = 0
+        self.duplicate_cards = 0
+        self.checksum_errors = 0
+
+# Door readers polled by this process: name -> serial port
+READER_PORTS = {
+    "door-1": SERIAL_PORT,
+}
+
+readers = {}
+
+def register_reader(name: str, port: str, baudrate: int = SERIAL_BAUDRATE) -> DoorReader:
+    """Add a door reader to the registry with its own serial session."""
+    door = DoorReader(name, SerialSession(port, baudrate))
+    readers[name] = door
+    return door
+
+def door_label(door: DoorReader) -> str:
+    """Name to show and log for a door; empty when only one door is monitored."""
+    return door.name if len(readers) > 1 else ""
+
+def door_prefix(door: DoorReader) -> str:
+    """Prefix for console messages about a door; empty when only one door is monitored."""
+    return f"{door.name}: " if len(readers) > 1 else ""
+
+def default_reader() -> DoorReader:
+    """Return the first registered door reader."""
+    return next(iter(readers.values()))
+
+for reader_name, reader_port in READER_PORTS.items():
+    register_reader(reader_name, reader_port)
+
+class LatencyStats:
+    """Rolling window of latency samples, in seconds."""
+
+    def __init__(self, samples: int = SALTO_RTT_SAMPLES):
+        self.samples = deque(maxlen=samples)
+        self.count = 0
+        self.last = 0.0
+
+    def record(self, seconds: float):
+        self.samples.append(seconds)
+        self.count += 1
+        self.last = seconds
+
+    def summary(self) -> dict:
+        """Average, median, 95th percentile and max over the window."""
+        if not self.samples:
+            return {'count': 0, 'avg': 0.0, 'p50': 0.0, 'p95': 0.0, 'max': 0.0}
+        ordered = sorted(self.samples)
+        return {
+            'count': self.count,
+            'avg': statistics.fmean(ordered),
+            'p50': ordered[len(ordered) // 2],
+            'p95': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+            'max': ordered[-1],
+        }
+
+def split_reply(buffer: bytearray, framing: str = SALTO_REPLY_FRAMING):
+    """Return (reply, rest) once buffer holds a complete reply, else None ("first_read": any data at all)."""
+    if framing == "first_read":
+        return (bytes(buffer), b"") if buffer else None
+    if framing == "length":
+        if len(buffer) < 2:
+            return None
+        end = 2 + int.from_bytes(buffer[:2], "big")
+        if len(buffer) < end:
+            return None
+        return bytes(buffer[2:end]), bytes(buffer[end:])
+    index = buffer.find(SALTO_REPLY_DELIMITER)
+    if index < 0:
+        return None
+    end = index + len(SALTO_REPLY_DELIMITER)
+    return bytes(buffer[:end]), bytes(buffer[end:])
+
+def read_reply(sock: socket.socket, deadline: float, framing: str = SALTO_REPLY_FRAMING):
+    """Read one complete reply before the monotonic deadline; returns (reply, extra bytes)."""
+    buffer = bytearray()
+    while True:
+        complete = split_reply(buffer, framing)
+        if complete is not None:
+            return complete
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise socket.timeout("Timed out waiting for a complete SALTO reply")
+        sock.settimeout(remaining)
+        chunk = sock.recv(4096)
+        if not chunk:
+            raise ConnectionError("Connection closed by SALTO server")
+        buffer += chunk
+
+class SaltoConnectionPool:
+    """Keeps TCP connections to the SALTO server open between card swipes."""
+
+    def __init__(self, host: str = SALTO_SERVER_IP, port: int = SALTO_SERVER_PORT, size: int = SALTO_POOL_SIZE,
+                 idle_timeout: float = SALTO_IDLE_TIMEOUT):
+        self.host = host
+        self.port = port
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self.idle = []  # (socket, last used)
+        self.lock = threading.Lock()
+        self.connects = 0
+        self.reuses = 0
+        self.request_ids = itertools.count(1)
+        self.rtt = LatencyStats()
+        # Server health: one failure takes it out of rotation until a retry succeeds
+        self.breaker = CircuitBreaker(failure_threshold=1, initial_backoff=SALTO_HEALTH_INTERVAL)
+        self.outstanding = 0
+
+    @staticmethod
+    def is_healthy(sock: socket.socket) -> bool:
+        """An idle connection is healthy when it has nothing to read: no EOF, no reset, no stray data."""
+        try:
+            readable, _, _ = select.select([sock], [], [], 0)
+        except (OSError, ValueError):
+            return False
+        return not readable
+
+    def connect(self) -> socket.socket:
+        sock = socket.create_connection((self.host, self.port), timeout=SALTO_CONNECT_TIMEOUT)
+        sock.settimeout(SALTO_IO_TIMEOUT)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        self.connects += 1
+        return sock
+
+    def acquire(self):
+        """Return (socket, reused), preferring a healthy idle connection."""
+        now = time.monotonic()
+        with self.lock:
+            while self.idle:
+                sock, last_used = self.idle.pop()
+                if now - last_used < self.idle_timeout and self.is_healthy(sock):
+                    self.reuses += 1
+                    return sock, True
+                sock.close()
+        return self.connect(), False
+
+    def release(self, sock: socket.socket):
+        """Return a connection after a successful exchange."""
+        with self.lock:
+            if len(self.idle) < self.size:
+                self.idle.append((sock, time.monotonic()))
+                return
+        sock.close()
+
+    def request(self, payload_bytes: bytes) -> bytes:
+        """Send a payload and return its reply, framed per SALTO_REPLY_FRAMING, recording the round-trip time.
+
+        Only one request is outstanding per connection, so the next reply on
+        it belongs to this request. A connection that timed out or sent
+        more than one reply is closed rather than pooled, so a late reply
+        can never be matched to a later request.
+
+        A pooled connection the server has dropped since its last use is
+        replaced with a fresh one once, without going through the caller's
+        retry delay.
+        """
+        request_id = next(self.request_ids)
+        while True:
+            sock, reused = self.acquire()
+            started = time.perf_counter()
+            try:
+                sock.settimeout(SALTO_IO_TIMEOUT)
+                sock.sendall(payload_bytes)
+                response, extra = read_reply(sock, time.monotonic() + SALTO_IO_TIMEOUT)
+            except socket.timeout:
+                sock.close()
+                raise
+            except OSError:
+                sock.close()
+                if reused:
+                    continue
+                raise
+            self.rtt.record(time.perf_counter() - started)
+            if extra:
+                console.print(f"[yellow]Request {request_id}: unexpected data after SALTO reply, "
+                              f"dropping connection.[/]")
+                sock.close()
+            else:
+                self.release(sock)
+            return response
+
+    def close(self):
+        with self.lock:
+            for sock, _ in self.idle:
+                sock.close()
+            self.idle.clear()
+
+class SaltoEndpoints:
+    """Several SALTO servers behind one request() call, with health tracking and failover.
+
+    A server that fails is skipped until its breaker allows a retry; a
+    health check thread tries to reconnect to it in the background. The
+    balancing policy orders the healthy servers: in configured order
+    ("failover"), rotating ("round_robin") or by fewest requests in flight
+    ("least_outstanding"). A request moves on to the next server on error.
+    """
+
+    def __init__(self, servers: list = None, balancing: str = SALTO_BALANCING):
+        if balancing not in ("failover", "round_robin", "least_outstanding"):
+            raise ValueError(f"Unknown balancing policy: {balancing}")
+        self.pools = [SaltoConnectionPool(host, port) for host, port in (servers or SALTO_SERVERS)]
+        self.balancing = balancing
+        self.rotation = itertools.count()
+        self.lock = threading.Lock()
+        self.rtt = LatencyStats()
+        self.health_thread = None
+
+    @property
+    def connects(self) -> int:
+        return sum(pool.connects for pool in self.pools)
+
+    @property
+    def reuses(self) -> int:
+        return sum(pool.reuses for pool in self.pools)
+
+    def _ordered(self) -> list:
+        """Servers in the order the balancing policy would try them; call with the lock held."""
+        now = time.monotonic()
+        healthy = [pool for pool in self.pools if pool.breaker.allow(now)]
+        if self.balancing == "round_robin" and healthy:
+            start = next(self.rotation) % len(healthy)
+            healthy = healthy[start:] + healthy[:start]
+        elif self.balancing == "least_outstanding":
+            healthy.sort(key=lambda pool: pool.outstanding)
+        if healthy:
+            return healthy
+        # Nothing healthy: still try the server due back soonest rather than fail outright
+        return [min(self.pools, key=lambda pool: pool.breaker.retry_at)]
+
+    def pick(self, tried: list = ()) -> SaltoConnectionPool:
+        """The one server to use for a single attempt, counted as outstanding until done() is called.
+
+        Servers in tried are skipped; None once the balancing order has none left.
+        """
+        with self.lock:
+            pools = [pool for pool in self._ordered() if pool not in tried]
+            if not pools:
+                return None
+            pool = pools[0]
+            pool.outstanding += 1
+        return pool
+
+    def done(self, pool: SaltoConnectionPool):
+        with self.lock:
+            pool.outstanding -= 1
+
+    def request(self, payload_bytes: bytes) -> bytes:
+        """Send a payload to the best available server, failing over on error."""
+        self.start_health_checks()
+        tried = []
+        last_error = None
+        while True:
+            # Only the server actually being tried counts as outstanding
+            pool = self.pick(tried)
+            if pool is None:
+                raise last_error
+            if tried:
+                failed = tried[-1]
+                console.print(f"[yellow]SALTO server {failed.host}:{failed.port} failed ({last_error}), "
+                              f"trying {pool.host}:{pool.port}.[/]")
+            tried.append(pool)
+            try:
+                response = pool.request(payload_bytes)
+            except OSError as e:
+                pool.breaker.record_failure()
+                last_error = e
+                continue
+            finally:
+                self.done(pool)
+            pool.breaker.record_success()
+            self.rtt.record(pool.rtt.last)
+            return response
+
+    def start_health_checks(self):
+        if self.health_thread is None and len(self.pools) > 1:
+            self.health_thread = threading.Thread(target=self._check_health, name="salto-health", daemon=True)
+            self.health_thread.start()
+
+    def _check_health(self):
+        while True:
+            time.sleep(SALTO_HEALTH_INTERVAL)
+            for pool in self.pools:
+                if pool.breaker.state == CircuitBreaker.CLOSED or not pool.breaker.allow():
+                    continue
+                try:
+                    pool.release(pool.connect())
+                except OSError:
+                    pool.breaker.record_failure()
+                    continue
+                pool.breaker.record_success()
+                console.print(f"[green]SALTO server {pool.host}:{pool.port} is reachable again.[/]")
+
+    def close(self):
+        for pool in self.pools:
+            pool.close()
+
+salto_servers = SaltoEndpoints()
 
 def send_payload_to_salto_server(payload: str):
     """Send the payload to the Salto server over TCP with retry logic."""
@@ -24,14 +637,10 @@ def send_payload_to_salto_server(payload: str):
             console.print(f"[blue]Sending payload to SALTO server: {payload}[/]")
             payload_bytes = bytes.fromhex(payload)
 
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.settimeout(2)  # Timeout for connection
-                s.connect((SALTO_SERVER_IP, SALTO_SERVER_PORT))
-                s.sendall(payload_bytes)
-
-                response = s.recv(4096)
-                console.print(f"[green]Response received from server: {response.hex()}[/]")
-                return  # Successfully sent and received response
+            response = salto_servers.request(payload_bytes)
+            console.print(f"[green]Response received from server: {response.hex()} "
+                          f"({salto_servers.rtt.last * 1000:.1f} ms)[/]")
+            return True  # Successfully sent and received response
 
         except Exception as e:
             console.print(f"[red]Error: {str(e)}[/]")
@@ -40,34 +649,471 @@ def send_payload_to_salto_server(payload: str):
                 time.sleep(delay)
             else:
                 console.print("[red]Max retries exceeded. Could not send the payload.[/]")
+    return False
+
+def deliver_payload(payload: str) -> bytes:
+    """Send a payload once to the SALTO servers, raising OSError on failure."""
+    return salto_servers.request(bytes.fromhex(payload))
+
+class PayloadOutbox:
+    """Append-only spool of undelivered card payloads, replayed in order.
+
+    Each payload is written as "P <id> <payload> [<reader>]" and marked
+    delivered with "A <id>"; on start the file is read back and every payload without an
+    ack is sent again, oldest first. Delivered records are compacted away
+    and the oldest payloads are dropped once the file would exceed max_bytes.
+    """
+
+    def __init__(self, path: str = OUTBOX_FILE, max_bytes: int = OUTBOX_MAX_BYTES, deliver=None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.deliver = deliver or deliver_payload
+        self.pending = OrderedDict()  # id -> (payload, reader)
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.file = None
+        self.thread = None
+        self.running = False
+        self.next_id = 1
+        self.size = 0
+        self.acked_records = 0
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+
+        self.delivered = 0
+        self.dropped = 0
+        self.rejected = 0  # Records that can never be delivered (torn or not hex)
+
+    @staticmethod
+    def _valid_payload(payload: str) -> bool:
+        try:
+            bytes.fromhex(payload)
+        except ValueError:
+            return False
+        return len(payload) % 2 == 0
+
+    def _load(self):
+        self.size = 0
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # Torn last record from a crash; start() cuts it off
+                self.size += len(line)
+                parts = line.decode("ascii", errors="replace").rstrip("\n").split(maxsplit=3)
+                try:
+                    if parts[0] == "P" and len(parts) >= 3:
+                        self.next_id = max(self.next_id, int(parts[1]) + 1)
+                        if not self._valid_payload(parts[2]):
+                            self.rejected += 1
+                            continue
+                        self.pending[int(parts[1])] = (parts[2], parts[3] if len(parts) == 4 else None)
+                    elif parts[0] == "A" and len(parts) == 2:
+                        self.pending.pop(int(parts[1]), None)
+                        self.acked_records += 1
+                except (IndexError, ValueError):
+                    continue  # Garbled record
+
+    def start(self):
+        """Load undelivered payloads from disk and start replaying them."""
+        with self.lock:
+            if self.running:
+                return
+            self._load()
+            self.file = open(self.path, "a", encoding="ascii")
+            if self.file.tell() > self.size:
+                # Appending after a torn record would run the next record on from it
+                self.file.truncate(self.size)
+            self.running = True
+        self.thread = threading.Thread(target=self._replay, name="salto-outbox", daemon=True)
+        self.thread.start()
+        if self.pending:
+            console.print(f"[yellow]Outbox holds {len(self.pending)} undelivered payloads.[/]")
+
+    def _write(self, record: str):
+        self.file.write(record)
+        self.size += len(record)
+        self.unsynced += 1
+        if self.unsynced >= OUTBOX_FSYNC_BATCH or time.monotonic() - self.last_sync >= OUTBOX_FSYNC_INTERVAL:
+            self._sync()
+
+    def _sync(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+
+    @staticmethod
+    def _record(record_id: int, payload: str, reader: str = None) -> str:
+        return f"P {record_id} {payload} {reader}\n" if reader else f"P {record_id} {payload}\n"
+
+    def add(self, payload: str, reader: str = None):
+        """Spool a payload that could not be delivered, with the name of the door it came from."""
+        if not self.running:
+            self.start()
+        with self.lock:
+            record_id = self.next_id
+            self.next_id += 1
+            self.pending[record_id] = (payload, reader)
+            self._write(self._record(record_id, payload, reader))
+            if self.size > self.max_bytes:
+                self._compact()
+            if self.size > self.max_bytes:
+                # Drop the oldest payloads down to 90% so the next swipes do not compact again
+                size = self.size
+                while size > self.max_bytes * 0.9 and len(self.pending) > 1:
+                    old_id, old_entry = self.pending.popitem(last=False)
+                    size -= len(self._record(old_id, *old_entry))
+                    self.dropped += 1
+                self._compact()
+        self.wakeup.set()
+
+    def _ack(self, record_id: int, outcome: str = "redelivered"):
+        with self.lock:
+            entry = self.pending.pop(record_id, None)
+            if entry is None:
+                return
+            if outcome == "redelivered":
+                self.delivered += 1
+            else:
+                self.rejected += 1
+            # stop() may have closed the spool while this delivery was in flight; without the ack
+            # the payload is simply sent again on the next start
+            if self.file is not None:
+                self._write(f"A {record_id}\n")
+                self.acked_records += 1
+                if self.acked_records >= OUTBOX_COMPACT_MIN and self.acked_records > len(self.pending):
+                    self._compact()
+        log_writer.card(*entry, outcome=outcome)
+
+    def _compact(self):
+        """Rewrite the spool with only the undelivered payloads."""
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="ascii") as f:
+            for record_id, (payload, reader) in self.pending.items():
+                f.write(self._record(record_id, payload, reader))
+            f.flush()
+            os.fsync(f.fileno())
+        self.file.close()
+        os.replace(temp_path, self.path)
+        self.file = open(self.path, "a", encoding="ascii")
+        self.size = os.path.getsize(self.path)
+        self.acked_records = 0
+        self.unsynced = 0
+
+    def _replay(self):
+        while self.running:
+            self.wakeup.wait(OUTBOX_RETRY_INTERVAL)
+            self.wakeup.clear()
+            while self.running:
+                with self.lock:
+                    if not self.pending:
+                        break
+                    record_id, (payload, reader) = next(iter(self.pending.items()))
+                try:
+                    self.deliver(payload)
+                except ValueError as e:
+                    # Not a payload at all: retrying cannot help, so drop it instead of blocking the rest
+                    console.print(f"[red]Outbox: dropping undeliverable payload {record_id} ({e}).[/]")
+                    self._ack(record_id, outcome="rejected")
+                    continue
+                except OSError as e:
+                    console.print(f"[yellow]Outbox: SALTO server still unreachable ({e}), "
+                                  f"{len(self.pending)} payloads waiting.[/]")
+                    break
+                self._ack(record_id)
+
+    def stop(self):
+        """Stop replaying and fsync anything not yet on disk."""
+        self.running = False
+        self.wakeup.set()
+        if self.thread:
+            self.thread.join(1.0)
+        with self.lock:
+            if self.file:
+                self._sync()
+                self.file.close()
+                self.file = None
+
+payload_outbox = PayloadOutbox()
+
+class PayloadForwarder:
+    """Bounded queue of card payloads drained by background forwarder threads.
+
+    The poll loop only enqueues, so a slow or unreachable SALTO server
+    delays forwarding but never door polling. When the queue is full the
+    overflow policy decides which payload is dropped.
+    """
+
+    def __init__(self, send=None, maxsize: int = FORWARD_QUEUE_SIZE, workers: int = FORWARD_WORKERS,
+                 overflow: str = FORWARD_OVERFLOW, outbox: PayloadOutbox = None):
+        if overflow not in ("drop_oldest", "drop_newest", "block"):
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self.send = send or send_payload_to_salto_server
+        self.queue = queue.Queue(maxsize)
+        self.workers = workers
+        self.overflow = overflow
+        self.outbox = outbox  # Where dropped and undeliverable payloads go, if anywhere
+        self.threads = []
+        self.lock = threading.Lock()
+        self.in_flight = {}  # worker thread -> (payload, reader) it is sending
+
+        self.enqueued = 0
+        self.dropped = 0
+        self.forwarded = 0
+        self.failed = 0
+        self.max_depth = 0
+
+    @property
+    def depth(self) -> int:
+        return self.queue.qsize()
+
+    def start(self):
+        with self.lock:
+            if self.threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f"salto-forwarder-{i}", daemon=True)
+                thread.start()
+                self.threads.append(thread)
+
+    def submit(self, payload: str, reader: str = None) -> bool:
+        """Queue a payload read by the named door for forwarding; returns False if it was dropped."""
+        if not self.threads:
+            self.start()
+        item = (payload, reader)
+        try:
+            if self.overflow == "block":
+                self.queue.put(item, timeout=FORWARD_BLOCK_TIMEOUT)
+            else:
+                self.queue.put_nowait(item)
+        except queue.Full:
+            if self.overflow != "drop_oldest":
+                self._drop(item, "new")
+                return False
+            try:
+                self._drop(self.queue.get_nowait(), "oldest")
+                self.queue.task_done()
+            except queue.Empty:
+                pass
+            try:
+                self.queue.put_nowait(item)
+            except queue.Full:
+                self._drop(item, "new")
+                return False
+        self.enqueued += 1
+        self.max_depth = max(self.max_depth, self.queue.qsize())
+        return True
+
+    def _drop(self, item: tuple, which: str):
+        self.dropped += 1
+        if self.outbox is not None:
+            console.print(f"[yellow]Forward queue full, moved {which} payload to the outbox.[/]")
+            self.outbox.add(*item)
+            log_writer.card(*item, outcome="spooled")
+        else:
+            console.print(f"[yellow]Forward queue full, dropped {which} payload.[/]")
+            log_writer.card(*item, outcome="dropped")
+
+    def _work(self):
+        worker = threading.current_thread()
+        while True:
+            item = self.queue.get()
+            try:
+                if item is None:
+                    return
+                with self.lock:
+                    self.in_flight[worker] = item
+                sent = self.send(item[0]) is not False
+                with self.lock:
+                    # Gone when stop() gave up waiting and already spooled it
+                    abandoned = self.in_flight.pop(worker, None) is None
+                if sent:
+                    self.forwarded += 1
+                    log_writer.card(*item, outcome="forwarded")
+                elif not abandoned:
+                    self.failed += 1
+                    if self.outbox is not None:
+                        self.outbox.add(*item)
+                    log_writer.card(*item, outcome="spooled" if self.outbox is not None else "failed")
+            finally:
+                self.queue.task_done()
+
+    def stop(self, timeout: float = 5.0):
+        """Let the workers finish the queued payloads, waiting at most timeout seconds."""
+        deadline = time.monotonic() + timeout
+        for _ in self.threads:
+            try:
+                self.queue.put(None, timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Full:
+                break
+        for thread in self.threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+        self.threads = [thread for thread in self.threads if thread.is_alive()]
+        if self.outbox is not None:
+            self._spool_remaining()
+
+    def _spool_remaining(self):
+        """Move payloads still queued or being sent to the outbox, so shutdown loses none."""
+        remaining = []
+        while True:
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            self.queue.task_done()
+            if item is not None:
+                remaining.append(item)
+        with self.lock:
+            remaining[:0] = self.in_flight.values()
+            self.in_flight.clear()
+        for item in remaining:
+            self.outbox.add(*item)
+            log_writer.card(*item, outcome="spooled")
+        if remaining:
+            console.print(f"[yellow]Moved {len(remaining)} unsent payloads to the outbox.[/]")
+
+    def stats(self) -> dict:
+        return {
+            'depth': self.depth,
+            'max_depth': self.max_depth,
+            'enqueued': self.enqueued,
+            'forwarded': self.forwarded,
+            'failed': self.failed,
+            'dropped': self.dropped,
+        }
+
+payload_forwarder = PayloadForwarder(outbox=payload_outbox)
+
+# Frame commands
+CMD_CARD_DATA = 0x05
+CMD_LOCK_STATUS = 0x21
+
+# ASCII code -> hex digit value (None for anything that is not a hex digit)
+_NIBBLE = [int(chr(c), 16) if chr(c) in string.hexdigits else None for c in range(256)]
+# XOR of the frame bytes -> checksum as two ASCII hex digits
+_CHECKSUM_HEX = [f"{~value & 0xFF:02X}".encode("ascii") for value in range(256)]
+
+def _hex_byte(data: bytes, index: int) -> int:
+    """Value of the two ASCII hex digits at data[index:index + 2]."""
+    try:
+        return _NIBBLE[data[index]] << 4 | _NIBBLE[data[index + 1]]
+    except TypeError:
+        raise ValueError(f"Invalid hex digits at offset {index}") from None
+
+def _xor_pairs(data: bytes, start: int, end: int) -> int:
+    value = 0
+    for i in range(start, end, 2):
+        value ^= _hex_byte(data, i)
+    return value
+
+def frame_checksum(ascii_body: bytes) -> bytes:
+    """Checksum of a frame body: XOR of its hex byte pairs, inverted (00012180 -> 5F)."""
+    if len(ascii_body) % 2:
+        raise ValueError("Frame body must have an even number of hex digits")
+    return _CHECKSUM_HEX[_xor_pairs(ascii_body, 0, len(ascii_body))]
+
+@functools.lru_cache(maxsize=1024)
+def build_frame(msg_type: int, seq: int, cmd: int, param: str = "00") -> bytes:
+    """Build a STX...CR frame for any type, sequence number, command and parameter.
+
+    Frames are cached, so rebuilding the same request in the poll loop
+    returns the already encoded bytes.
+    """
+    ascii_body = f"{msg_type:02X}{seq:02X}{cmd:02X}{param}".encode("ascii")
+    return STX + ascii_body + frame_checksum(ascii_body) + CR
 
 def build_get_lock_status_frame():
     """Build and return the frame to get lock status."""
-    stx = bytes([0x02])
-    ascii_payload = "00012100DF".encode("ascii")  # Modify as needed
-    cr = bytes([0x0D])
-    return stx + ascii_payload + cr
-
-def parse_response(ascii_data: str):
-    """Parse the lock status from the ASCII response."""
-    global last_status
-    if len(ascii_data) >= 10:
-        parameter = ascii_data[6:8]
-        status_map = {
-            "80": ("Door is Locked", "80"),
-            "81": ("The door is held open", "81"),
-            "82": ("Locked and closed from inside", "82"),
-            "83": ("Locked but open, lock is in passage mode", "83")
-        }
-        result = status_map.get(parameter, ("Unknown Status", parameter))
+    return build_frame(0x00, 0x01, CMD_LOCK_STATUS, "00")
+
+def verify_frame(frame: bytes) -> bool:
+    """Check the checksum of a complete STX...CR frame without copying it."""
+    checksum_at = len(frame) - 3
+    if checksum_at < 7 or checksum_at % 2 == 0:
+        return False
+    try:
+        # The checksum is the inverted XOR, so XOR-ing it in gives 0xFF
+        return _xor_pairs(frame, 1, checksum_at) ^ _hex_byte(frame, checksum_at) == 0xFF
+    except ValueError:
+        return False
+
+def frame_text(frame: bytes) -> str:
+    """ASCII text between STX and CR, for display and logging."""
+    return frame[1:-1].decode("ascii")
+
+class Frame:
+    """A checksum-verified STX...CR frame whose fields are read from the raw bytes."""
+
+    __slots__ = ('raw', 'msg_type', 'seq', 'cmd')
+
+    def __init__(self, raw: bytes):
+        self.raw = raw
+        self.msg_type = _hex_byte(raw, 1)
+        self.seq = _hex_byte(raw, 3)
+        self.cmd = _hex_byte(raw, 5)
+
+    @property
+    def param(self):
+        return memoryview(self.raw)[7:-3]
+
+    @property
+    def text(self) -> str:
+        return frame_text(self.raw)
+
+    @property
+    def is_card(self) -> bool:
+        """Whether the frame carries a card payload (type 00, cmd 05)."""
+        return self.cmd == CMD_CARD_DATA and self.msg_type == 0x00
+
+STATUS_MAP = {
+    0x80: ("Door is Locked", "80"),
+    0x81: ("The door is held open", "81"),
+    0x82: ("Locked and closed from inside", "82"),
+    0x83: ("Locked but open, lock is in passage mode", "83")
+}
+
+class PollResult:
+    """Outcome of a poll, shared by the state tracker and the sinks."""
+
+    __slots__ = ('status_changed', 'current_status', 'status_code', 'frame')
+
+    def __init__(self, status_changed: bool = False, current_status: str = None, status_code: str = None,
+                 frame: Frame = None):
+        self.status_changed = status_changed
+        self.current_status = current_status
+        self.status_code = status_code
+        self.frame = frame
+
+    @property
+    def ascii_payload(self) -> str:
+        return self.frame.text if self.frame else ""
+
+    @property
+    def response(self) -> bytes:
+        return self.frame.raw if self.frame else b''
+
+# Shared results for polls without a status change; never modify these
+NO_DATA = PollResult()
+NO_CHANGE = PollResult()
+
+def parse_response(frame: Frame, door: DoorReader = None):
+    """Parse the lock status from a verified frame."""
+    door = door or default_reader()
+    if len(frame.raw) >= 12:
+        parameter = _hex_byte(frame.raw, 7)
+        result = STATUS_MAP.get(parameter)
+        if result is None:
+            result = ("Unknown Status", f"{parameter:02X}")
         current_status = result[0]
         status_code = result[1]
-        if current_status != last_status:
-            last_status = current_status
+        if current_status != door.last_status:
+            door.last_status = current_status
             return True, current_status, status_code
     return False, None, None
 
-def print_large_text(message: str, status_code: str, ascii_response: str = "", response: str = ""):
+def print_large_text(message: str, status_code: str, ascii_response: str = "", response: str = "", door_name: str = ""):
     """Display the status and frame details."""
     status_content = Align.center(
         f"[green]Status: {message}\n"
@@ -76,7 +1122,7 @@ def print_large_text(message: str, status_code: str, ascii_response: str = "", r
     )
     status_panel = Panel(
         status_content,
-        title="[cyan]DOOR STATUS MONITOR",
+        title=f"[cyan]DOOR STATUS MONITOR - {door_name}" if door_name else "[cyan]DOOR STATUS MONITOR",
         border_style="cyan",
         padding=(1, 2)
     )
@@ -112,121 +1158,859 @@ def print_large_text(message: str, status_code: str, ascii_response: str = "", r
         )
         console.print(payload_panel)
 
-def send_command():
+class DedupCache:
+    """LRU cache with a TTL that recognises a card payload repeated on the same reader.
+
+    Every sighting pushes the expiry back, so a card held on the reader is
+    forwarded once and again only after it has been away for the whole window.
+    """
+
+    def __init__(self, ttl: float = DEDUP_WINDOW, max_entries: int = DEDUP_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # (reader, payload) -> expiry
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def seen(self, reader: str, payload: bytes, now: float = None) -> bool:
+        """Record a payload and return True if it repeats one inside the window."""
+        now = time.monotonic() if now is None else now
+        key = (reader, payload)
+        with self.lock:
+            expiry = self.entries.get(key)
+            self.entries[key] = now + self.ttl
+            self.entries.move_to_end(key)
+            if expiry is not None and expiry > now:
+                self.hits += 1
+                return True
+            self.misses += 1
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            return False
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+card_dedup = DedupCache()
+
+def forward_card_payload(frame: Frame, forward=None, door: DoorReader = None, now: float = None):
+    """Check a card frame's payload size and hand it to forward(payload, door name).
+
+    now is the time the frame arrived, in seconds, for the repeat check; it
+    defaults to the monotonic clock, and replays pass the recorded time.
+    """
+    forward = forward or payload_forwarder.submit
+    door = door or default_reader()
+    payload = frame.param
+    length_in_bytes = len(payload) // 2
+    print(f"Length of the payload in bytes: {length_in_bytes}")
+    if length_in_bytes > 36:
+        print("Payload is too large, not sending to the server.")
+    elif card_dedup.seen(door.name, bytes(payload), now):
+        door.duplicate_cards += 1
+    else:
+        forward(str(payload, "ascii"), door.name)
+
+def report_checksum_error(response: bytes, door: DoorReader):
+    """Show and log a frame that failed its checksum."""
+    error_message = f"Checksum error in frame: {response.hex()}"
+    console.print(f"[red]{door_prefix(door)}{error_message}[/]")
+    log_status(error_message, "ERR", door)
+
+def process_responses(responses: list, forward=None, door: DoorReader = None, on_checksum_error=None,
+                      now: float = None):
+    """Forward card frames and return the status result for a batch of frames."""
+    door = door or default_reader()
+    on_checksum_error = on_checksum_error or report_checksum_error
+    result = NO_DATA
+    for response in responses:
+        if not verify_frame(response):
+            door.checksum_errors += 1
+            on_checksum_error(response, door)
+            continue
+
+        frame = Frame(response)
+
+        # Card frames carry a payload for the server, not a lock status
+        if frame.is_card:
+            door.card_reads += 1
+            forward_card_payload(frame, forward, door, now)
+            continue
+
+        # Handle the response from serial communication
+        status_changed, current_status, status_code = parse_response(frame, door)
+        if status_changed:
+            result = PollResult(True, current_status, status_code, frame)
+        elif result is NO_DATA:
+            result = NO_CHANGE
+
+    return result
+
+def serial_error_message(error: Exception, door: DoorReader) -> str:
+    """Describe a serial error, including the port's breaker state when it is not closed."""
+    error_message = f"Serial error: {str(error)}"
+    breaker = door.session.breaker
+    if breaker.state != CircuitBreaker.CLOSED:
+        error_message += f" (circuit {breaker.state}, retry in {breaker.retry_in():.1f}s)"
+    return error_message
+
+def report_serial_error(error: Exception, door: DoorReader):
+    """Show and log a serial error for a door reader."""
+    error_message = serial_error_message(error, door)
+    console.print(f"[red]{door_prefix(door)}{error_message}[/]")
+    log_status(error_message, "ERR", door)
+
+def handle_door_error(error: Exception, door: DoorReader):
+    """Drop the door's port and hold off polling it until its breaker allows a retry."""
+    door.session.close()
+    door.scheduler.record(False)
+    door.scheduler.defer(door.session.breaker.retry_in())
+    report_serial_error(error, door)
+
+def send_command(door: DoorReader = None):
     """Read from serial port, process frame, and send to the server."""
-    port = 'COM5'
-    baudrate = 115200
+    door = door or default_reader()
     try:
-        with serial.Serial(port, baudrate, timeout=0.1) as ser:
-            frame = build_get_lock_status_frame()
-            ser.write(frame)
+        frame = build_get_lock_status_frame()
+        responses = door.session.transact(frame)
+    except (serial.SerialException, OSError) as e:
+        report_serial_error(e, door)
+        return NO_DATA
 
-            while ser.out_waiting > 0:
-                pass
+    return process_responses(responses, door=door)
 
-            response = ser.readline()
-
-            # Check for valid response
-            if response.startswith(b'\x02') and response.endswith(b'\r'):
-                clean_response = response[13:-1].decode('utf-8', errors='ignore')
-                if clean_response[4:6] == '05' and clean_response[0:2] == '00':
-                    payload = clean_response[6:-2]
-                    try:
-                        byte_data = bytes.fromhex(payload)
-                        length_in_bytes = len(byte_data)
-                        print(f"Length of the payload in bytes: {length_in_bytes}")
-                        if length_in_bytes > 36:
-                            print("Payload is too large, not sending to the server.")
-                        else:
-                            send_payload_to_salto_server(payload)
-                    except ValueError:
-                        pass
-
-            # Handle the response from serial communication
-            if response.startswith(b'\x02') and response.endswith(b'\x0D'):
-                try:
-                    ascii_data = response[1:-1].decode("ascii")
-                    status_changed, current_status, status_code = parse_response(ascii_data)
-                    ascii_payload = ascii_data
-                    return {
-                        'status_changed': status_changed,
-                        'current_status': current_status,
-                        'status_code': status_code,
-                        'ascii_payload': ascii_payload,
-                        'response': response,
-                    }
-                except UnicodeDecodeError:
-                    pass
-
-    except serial.SerialException as e:
-        error_message = f"Serial error: {str(e)}"
-        console.print(f"[red]{error_message}[/]")
-        log_status(error_message, "ERR")
-        return {
-            'status_changed': False,
-            'current_status': None,
-            'status_code': None,
-            'response': b'',
-            'ascii_payload': ""
-        }
+def poll_readers(doors: list = None) -> list:
+    """Poll every door reader once and return (door, result) pairs in order.
+
+    Requests go out to all readers first and the replies are collected
+    against one shared deadline: once it has passed, a door is only read if
+    its reply is already waiting, so a round costs about one read timeout
+    in total however many doors stay silent.
+    """
+    doors = list(readers.values()) if doors is None else doors
+    frame = build_get_lock_status_frame()
+
+    sent = []
+    for door in doors:
+        try:
+            door.session.write_frame(frame)
+            sent.append(door)
+        except (serial.SerialException, OSError) as e:
+            handle_door_error(e, door)
 
-    return {
-        'status_changed': False,
-        'current_status': None,
-        'status_code': None,
-        'response': b'',
-        'ascii_payload': ""
-    }
+    results = []
+    deadline = time.monotonic() + max((door.session.timeout for door in sent), default=0.0)
+    for door in sent:
+        try:
+            responses = door.session.read_frames(deadline)
+        except (serial.SerialException, OSError) as e:
+            handle_door_error(e, door)
+            continue
+        card_reads = door.card_reads
+        result = process_responses(responses, door=door)
+        door.scheduler.record(result.status_changed or door.card_reads > card_reads)
+        results.append((door, result))
+    return results
+
+def due_readers(now: float = None) -> list:
+    """Return the registered door readers whose next poll is due."""
+    now = time.monotonic() if now is None else now
+    return [door for door in readers.values() if door.scheduler.is_due(now)]
+
+def wait_for_next_poll():
+    """Sleep until the earliest scheduled poll of any door reader."""
+    now = time.monotonic()
+    delay = min((door.scheduler.delay(now) for door in readers.values()), default=POLL_MIN_INTERVAL)
+    if delay > 0:
+        time.sleep(delay)
+
+def close_readers():
+    """Close the serial session of every registered door reader."""
+    for door in readers.values():
+        door.session.close()
+
+# Request pipelining on one serial link
+PIPELINE_DEPTH = 4
+REQUEST_TIMEOUT = 0.5
+
+class RequestPipeline:
+    """Keeps several commands in flight on a session and matches replies by sequence number."""
+
+    def __init__(self, session: SerialSession, depth: int = PIPELINE_DEPTH, timeout: float = REQUEST_TIMEOUT):
+        self.session = session
+        self.depth = depth
+        self.timeout = timeout
+        self.pending = {}  # seq -> (cmd, deadline, callback)
+        self.next_seq = 1
+        self.sent = 0
+        self.completed = 0
+        self.timed_out = 0
+
+    def can_submit(self) -> bool:
+        return len(self.pending) < self.depth
+
+    def _allocate_seq(self) -> int:
+        for _ in range(0xFF):
+            seq = self.next_seq
+            self.next_seq = seq % 0xFF + 1  # Cycle through 01..FF
+            if seq not in self.pending:
+                return seq
+        raise RuntimeError("No free sequence number")
+
+    def submit(self, cmd: int, param: str = "00", callback=None, msg_type: int = 0x00) -> int:
+        """Send a command and return its sequence number.
+
+        callback(seq, frame) is called with the matching reply, or with
+        None as the frame when no reply arrives within the timeout.
+        """
+        seq = self._allocate_seq()
+        self.session.write_frame(build_frame(msg_type, seq, cmd, param))
+        self.pending[seq] = (cmd, time.monotonic() + self.timeout, callback)
+        self.sent += 1
+        return seq
+
+    def _match(self, frame: bytes):
+        if not verify_frame(frame):
+            return None
+        try:
+            seq = _hex_byte(frame, 3)
+            cmd = _hex_byte(frame, 5)
+        except (ValueError, IndexError):
+            return None
+        request = self.pending.get(seq)
+        if request is None or request[0] != cmd:
+            return None
+        del self.pending[seq]
+        return seq, request[2]
+
+    def poll(self) -> list:
+        """Read replies, complete matching requests and expire late ones.
+
+        Frames that do not answer an outstanding request (card frames,
+        stray replies) are returned to the caller.
+        """
+        unsolicited = []
+        for frame in self.session.read_frames():
+            matched = self._match(frame)
+            if matched is None:
+                unsolicited.append(frame)
+                continue
+            seq, callback = matched
+            self.completed += 1
+            if callback:
+                callback(seq, frame)
+
+        now = time.monotonic()
+        for seq, (cmd, deadline, callback) in list(self.pending.items()):
+            if now >= deadline:
+                del self.pending[seq]
+                self.timed_out += 1
+                if callback:
+                    callback(seq, None)
+        return unsolicited
+
+def send_commands(door: DoorReader, commands: list, depth: int = PIPELINE_DEPTH, on_status=None) -> list:
+    """Pipeline (cmd, param) commands to a door and return the replies in order.
+
+    A reply is None when the lock did not answer in time. Lock status
+    replies go through process_responses() like polled ones, so the door's
+    status is tracked and on_status(result, door) is called on a change.
+    Card frames that arrive meanwhile are processed as usual.
+    """
+    pipeline = RequestPipeline(door.session, depth)
+    replies = [None] * len(commands)
+    order = {}
+
+    def on_reply(seq, frame):
+        replies[order.pop(seq)] = frame
+        if frame is not None and Frame(frame).cmd == CMD_LOCK_STATUS:
+            result = process_responses([frame], door=door)
+            if result.status_changed and on_status:
+                on_status(result, door)
+
+    try:
+        index = 0
+        while index < len(commands) or pipeline.pending:
+            while index < len(commands) and pipeline.can_submit():
+                cmd, param = commands[index]
+                order[pipeline.submit(cmd, param, on_reply)] = index
+                index += 1
+            unsolicited = pipeline.poll()
+            if unsolicited:
+                process_responses(unsolicited, door=door)
+    except (serial.SerialException, OSError):
+        door.session.close()
+        raise
+    return replies
+
+def report_status(result: PollResult, door: DoorReader = None):
+    """Display a status change and write it to the log."""
+    door = door or default_reader()
+    clear_console()
+    print_large_text(
+        result.current_status,
+        result.status_code,
+        result.ascii_payload,
+        result.response,
+        door_label(door),
+    )
+
+    timestamp_text_content = Align.center(
+        f"[white]Last updated at : [cyan]{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}[/]",
+        vertical="middle"
+    )
+    timestamp_text_panel = Panel(
+        timestamp_text_content,
+        title="[yellow]Last Updated",
+        border_style="yellow",
+        padding=(1, 2)
+    )
+    console.print(timestamp_text_panel)
+    log_status(result.current_status, result.status_code, door)
 
 def continuous_check():
-    """Continuously check the lock status."""
-    global last_update_time
+    """Continuously check the lock status of every registered door reader."""
+    if SALTO_REPLY_FRAMING == "first_read":
+        console.print("[yellow]SALTO_REPLY_FRAMING is \"first_read\": replies split across reads "
+                      "will be taken as partial replies.[/]")
+    payload_outbox.start()
     try:
         while True:
-            result = send_command()
-            if not result:
-                continue
+            for door, result in poll_readers(due_readers()):
+                if result.status_changed:
+                    report_status(result, door)
+            wait_for_next_poll()
 
-            current_time = time.time()
+    except KeyboardInterrupt:
+        console.print("\n" + str(Align.center(
+            "[white]Process terminated by user. Exiting...[/]",
+            vertical="middle"
+        )))
+    finally:
+        close_readers()
+        payload_forwarder.stop()
+        payload_outbox.stop()
+        log_writer.stop()
+        stats = payload_forwarder.stats()
+        console.print(f"[white]Forwarded {stats['forwarded']} payloads, {stats['failed']} failed, "
+                      f"{stats['dropped']} dropped, max queue depth {stats['max_depth']}, "
+                      f"{len(payload_outbox.pending)} waiting in the outbox[/]")
+        console.print(f"[white]Repeated card payloads suppressed: {card_dedup.hits} "
+                      f"({card_dedup.hit_rate:.0%} of card reads)[/]")
+        rtt = salto_servers.rtt.summary()
+        if rtt['count']:
+            console.print(f"[white]SALTO round trip: avg {rtt['avg'] * 1000:.1f} ms, "
+                          f"p95 {rtt['p95'] * 1000:.1f} ms, max {rtt['max'] * 1000:.1f} ms[/]")
+        salto_servers.close()
+        repeats = log_writer.repeats
+        if repeats.counts:
+            counts = ", ".join(f"{name}: {count}" for name, count in repeats.counts.items())
+            console.print(f"[white]Errors by class: {counts} ({repeats.suppressed} repeats collapsed)[/]")
 
-            if result['status_changed']:
-                clear_console()
-                print_large_text(
-                    result['current_status'],
-                    result['status_code'],
-                    result['ascii_payload'],
-                    result['response'],
-                )
+async def async_read_reply(reader: asyncio.StreamReader, framing: str = SALTO_REPLY_FRAMING) -> bytes:
+    """Read one SALTO reply from an asyncio stream, framed per SALTO_REPLY_FRAMING."""
+    if framing == "first_read":
+        reply = await reader.read(4096)
+        if not reply:
+            raise ConnectionError("Connection closed by SALTO server")
+        return reply
+    if framing == "length":
+        length = int.from_bytes(await reader.readexactly(2), "big")
+        return await reader.readexactly(length)
+    return await reader.readuntil(SALTO_REPLY_DELIMITER)
 
-                timestamp_text_content = Align.center(
-                    f"[white]Last updated at : [cyan]{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}[/]",
-                    vertical="middle"
-                )
-                timestamp_text_panel = Panel(
-                    timestamp_text_content,
-                    title="[yellow]Last Updated",
-                    border_style="yellow",
-                    padding=(1, 2)
+async def async_send_payload_to_salto_server(payload: str):
+    """Send the payload to the Salto server with asyncio streams and retry logic."""
+    retries = 5
+    delay = 0.5
+    for attempt in range(retries):
+        try:
+            console.print(f"[blue]Sending payload to SALTO server: {payload}[/]")
+            payload_bytes = bytes.fromhex(payload)
+
+            # A failed server's breaker opens, so the next attempt goes to the next server
+            server = salto_servers.pick()
+            try:
+                reader, writer = await asyncio.wait_for(
+                    asyncio.open_connection(server.host, server.port), timeout=SALTO_CONNECT_TIMEOUT
                 )
-                console.print(timestamp_text_panel)
-                log_status(result['current_status'], result['status_code'])
+                try:
+                    started = time.perf_counter()
+                    writer.write(payload_bytes)
+                    await writer.drain()
+                    response = await asyncio.wait_for(async_read_reply(reader), timeout=SALTO_IO_TIMEOUT)
+                    salto_servers.rtt.record(time.perf_counter() - started)
+                finally:
+                    writer.close()
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+                server.breaker.record_failure()
+                raise
+            finally:
+                salto_servers.done(server)
+            server.breaker.record_success()
+
+            console.print(f"[green]Response received from server: {response.hex()} "
+                          f"({salto_servers.rtt.last * 1000:.1f} ms)[/]")
+            return True  # Successfully sent and received response
+
+        except Exception as e:
+            console.print(f"[red]Error: {str(e)}[/]")
+            if attempt < retries - 1:
+                console.print(f"[yellow]Retrying in {delay} seconds...[/]")
+                await asyncio.sleep(delay)
+            else:
+                console.print("[red]Max retries exceeded. Could not send the payload.[/]")
+    return False
+
+class AsyncSerialReader:
+    """Feeds frames from a SerialSession to asyncio through the port's file descriptor."""
+
+    def __init__(self, session: SerialSession, loop):
+        self.session = session
+        self.loop = loop
+        self.frames = asyncio.Queue()
+        self.fd = None
+        self.watchable = True  # False once the port or loop turns out not to support fd watching
+
+    def attach(self):
+        """Open the port and watch its file descriptor for incoming data, where that is possible."""
+        ser = self.session.open()
+        if self.fd is None and self.watchable:
+            try:
+                fd = ser.fileno()
+                self.loop.add_reader(fd, self._on_readable)
+            except (io.UnsupportedOperation, OSError, NotImplementedError):
+                # Windows COM ports have no file descriptor, and the Proactor loop has no add_reader
+                self.watchable = False
+                return
+            self.fd = fd
+
+    def detach(self):
+        """Stop watching the port and close it."""
+        if self.fd is not None:
+            self.loop.remove_reader(self.fd)
+            self.fd = None
+        self.session.close()
+
+    def _on_readable(self):
+        ser = self.session.ser
+        try:
+            data = ser.read(ser.in_waiting or 1)
+        except (serial.SerialException, OSError) as e:
+            self.detach()
+            self.frames.put_nowait(e)
+            return
+        for frame in self.session.deframer.feed(data):
+            self.frames.put_nowait(frame)
+
+    async def transact(self, frame: bytes, timeout: float = SERIAL_TIMEOUT) -> list:
+        """Write a frame and return the frames received within the timeout."""
+        try:
+            self.attach()
+            if self.fd is None:
+                # No file descriptor (Windows COM ports): read in a worker thread
+                return await self.loop.run_in_executor(None, self.session.transact, frame)
+            await self.loop.run_in_executor(None, self.session.write_frame, frame)
+        except (serial.SerialException, OSError):
+            self.detach()
+            raise
+
+        try:
+            item = await asyncio.wait_for(self.frames.get(), timeout)
+        except asyncio.TimeoutError:
+            return []
+
+        responses = []
+        while True:
+            if isinstance(item, Exception):
+                raise item
+            responses.append(item)
+            if self.frames.empty():
+                return responses
+            item = self.frames.get_nowait()
+
+async def async_poll_loop(door: DoorReader, payloads: asyncio.Queue, results: asyncio.Queue):
+    """Poll one door and queue card payloads and status changes for the other tasks."""
+    serial_reader = AsyncSerialReader(door.session, asyncio.get_running_loop())
+    frame = build_get_lock_status_frame()
+    try:
+        while True:
+            try:
+                responses = await serial_reader.transact(frame)
+            except (serial.SerialException, OSError) as e:
+                error_message = serial_error_message(e, door)
+                console.print(f"[red]{door_prefix(door)}{error_message}[/]")
+                await results.put(('error', error_message, door))
+                door.scheduler.record(False)
+                door.scheduler.defer(door.session.breaker.retry_in())
+                await asyncio.sleep(door.scheduler.delay())
+                continue
+
+            card_reads = door.card_reads
+            result = process_responses(
+                responses, forward=lambda payload, reader: payloads.put_nowait((payload, reader)), door=door
+            )
+            door.scheduler.record(result.status_changed or door.card_reads > card_reads)
+            if result.status_changed:
+                await results.put(('status', result, door))
+            await asyncio.sleep(door.scheduler.delay())
+    finally:
+        serial_reader.detach()
+
+async def async_forward_loop(payloads: asyncio.Queue):
+    """Forward queued card payloads to the SALTO server."""
+    while True:
+        payload, reader = await payloads.get()
+        if not await async_send_payload_to_salto_server(payload):
+            await asyncio.get_running_loop().run_in_executor(None, payload_outbox.add, payload, reader)
+            log_writer.card(payload, reader, outcome="spooled")
+        else:
+            log_writer.card(payload, reader, outcome="forwarded")
+
+async def async_sink_loop(results: asyncio.Queue):
+    """Display and log status changes without blocking the poll loop on console or disk."""
+    loop = asyncio.get_running_loop()
+    while True:
+        kind, item, door = await results.get()
+        if kind == 'status':
+            await loop.run_in_executor(None, report_status, item, door)
+        else:
+            await loop.run_in_executor(None, log_status, item, "ERR", door)
+
+async def run_async_monitor(doors: list = None):
+    """Run polling for every door, forwarding and logging as concurrent asyncio tasks."""
+    doors = list(readers.values()) if doors is None else doors
+    payloads = asyncio.Queue()
+    results = asyncio.Queue()
+    await asyncio.gather(
+        *(async_poll_loop(door, payloads, results) for door in doors),
+        async_forward_loop(payloads),
+        async_sink_loop(results),
+    )
 
+def async_continuous_check():
+    """Continuously check the lock status using the asyncio runtime."""
+    payload_outbox.start()
+    try:
+        asyncio.run(run_async_monitor())
     except KeyboardInterrupt:
         console.print("\n" + str(Align.center(
             "[white]Process terminated by user. Exiting...[/]",
             vertical="middle"
         )))
+    finally:
+        payload_outbox.stop()
+        log_writer.stop()
+
+class RepeatFilter:
+    """Collapses bursts of the same error into one entry plus "repeated N times" summaries.
+
+    The first occurrence of an error on a door is logged as usual. Repeats
+    less than `window` seconds apart are only counted, and written as one
+    summary entry when the burst ends or every `summary_interval` seconds
+    while it lasts. Totals per error class (the text before the first
+    colon) are kept in `counts`.
+    """
+
+    # Parts of a message that change between otherwise identical errors
+    VARIABLE = re.compile(r" \(circuit [^)]*\)$")
+
+    def __init__(self, window: float = LOG_REPEAT_WINDOW, summary_interval: float = LOG_REPEAT_SUMMARY):
+        self.window = window
+        self.summary_interval = summary_interval
+        self.bursts = {}  # (door, message) -> [message, repeats, last seen, last entry written]
+        self.lock = threading.Lock()
+
+        self.counts = {}
+        self.suppressed = 0
+
+    def admit(self, status: str, door, now: float) -> list:
+        """Count an error and return the (status, door) entries that should be written for it.
+
+        door is any hashable key for the door, handed back unchanged in the entries.
+        """
+        key = (door, self.VARIABLE.sub("", status))
+        error_class = status.split(":", 1)[0]
+        entries = []
+        with self.lock:
+            self.counts[error_class] = self.counts.get(error_class, 0) + 1
+            burst = self.bursts.get(key)
+            if burst is not None and now - burst[2] <= self.window:
+                burst[1] += 1
+                burst[2] = now
+                self.suppressed += 1
+                if now - burst[3] >= self.summary_interval:
+                    entries.append(self._summary(burst, door, now))
+                return entries
+            if burst is not None and burst[1]:
+                entries.append(self._summary(burst, door, now))
+            self.bursts[key] = [status, 0, now, now]
+        entries.append((status, door))
+        return entries
+
+    def expire(self, now: float) -> list:
+        """Return summaries for bursts that have ended and forget them."""
+        entries = []
+        with self.lock:
+            for key, burst in list(self.bursts.items()):
+                if now - burst[2] > self.window:
+                    if burst[1]:
+                        entries.append(self._summary(burst, key[0], now))
+                    del self.bursts[key]
+        return entries
+
+    @staticmethod
+    def _summary(burst: list, door, now: float) -> tuple:
+        elapsed = min(now, burst[2]) - burst[3]
+        entry = (f"{burst[0]} (repeated {burst[1]} times in {elapsed:.0f}s)", door)
+        burst[1] = 0
+        burst[3] = now
+        return entry
+
+class LogWriter:
+    """Background thread that batches log entries into LOG_FILE.
+
+    Callers only queue the entry; formatting and disk writes happen on the
+    writer thread, which flushes once LOG_FLUSH_BYTES are buffered, every
+    LOG_FLUSH_INTERVAL seconds and on stop(). Entries are dropped rather
+    than waited on when the queue is full. Errors go through a RepeatFilter
+    first, so a burst of the same error costs one entry, not thousands.
+
+    The writer thread also rotates the file, by size or at midnight, into
+    gzip segments named "<path>.<YYYYmmdd-HHMMSS-micros>.gz" and keeps only the
+    newest `backups` of them. Entries are also passed to any sinks opened
+    in start(): the binary event store and the SQLite database, which also
+    records card forwarding outcomes. Sinks are flushed with the file.
+    """
+
+    CARD = object()
+
+    STOP = object()
+
+    def __init__(self, path: str = LOG_FILE, maxsize: int = LOG_QUEUE_SIZE,
+                 flush_bytes: int = LOG_FLUSH_BYTES, flush_interval: float = LOG_FLUSH_INTERVAL,
+                 rotate: str = LOG_ROTATE, max_bytes: int = LOG_MAX_BYTES, backups: int = LOG_BACKUPS,
+                 event_store: str = EVENT_STORE_FILE, event_db: str = EVENT_DB_FILE):
+        if rotate not in ("size", "daily", None):
+            raise ValueError(f"Unknown log rotation: {rotate}")
+        self.path = path
+        self.event_store = event_store
+        self.event_db = event_db
+        self.sinks = []
+        self.card_sinks = []
+        self.rotate = rotate
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.size = 0
+        self.day = None
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self.lock = threading.Lock()
+        self.thread = None
+        self.file = None
+        self.second = None
+        self.timestamp = ""
+        self.repeats = RepeatFilter()
+
+        self.written = 0
+        self.flushes = 0
+        self.dropped = 0
+        self.rotations = 0
+
+    def _open(self):
+        self.file = open(self.path, "a", encoding="utf-8")
+        self.size = self.file.tell()
+        # An existing file belongs to the day it was last written
+        when = os.path.getmtime(self.path) if self.size else time.time()
+        self.day = datetime.fromtimestamp(when).date()
+
+    def start(self):
+        with self.lock:
+            if self.thread is None:
+                self._open()
+                # Not imported at the top: the sinks' log converters import this module
+                if self.event_store:
+                    from event_store import EventStore
+                    self.sinks.append(EventStore(self.event_store))
+                if self.event_db:
+                    from event_db import EventDatabase
+                    database = EventDatabase(self.event_db)
+                    self.sinks.append(database)
+                    self.card_sinks.append(database)
+                self.thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+                self.thread.start()
+
+    def log(self, status: str, status_code: str, door_name: str = None, reader: str = None):
+        """Queue an entry without waiting on the disk.
+
+        door_name is the tag shown in the text line; reader is the door's
+        real name given to the sinks, and defaults to door_name.
+        """
+        if self.thread is None:
+            self.start()
+        door = (door_name, reader if reader is not None else door_name)
+        if status_code == "ERR":
+            entries = self.repeats.admit(status, door, time.monotonic())
+        else:
+            entries = [(status, door)]
+        now = time.time()
+        for status, (door_name, reader) in entries:
+            try:
+                self.queue.put_nowait((now, status, status_code, door_name, reader))
+            except queue.Full:
+                self.dropped += 1
+
+    def card(self, payload: str, reader: str = None, outcome: str = "forwarded"):
+        """Queue a card forwarding outcome for the sinks that record them."""
+        if not self.event_db:
+            return
+        if self.thread is None:
+            self.start()
+        try:
+            self.queue.put_nowait((self.CARD, time.time(), payload, outcome, reader))
+        except queue.Full:
+            self.dropped += 1
+
+    def _add_summaries(self, buffer: list, now: float) -> int:
+        size = 0
+        for status, (door_name, reader) in self.repeats.expire(now):
+            when = time.time()
+            entry = self._format(when, status, "ERR", door_name, reader)
+            buffer.append(entry)
+            size += len(entry)
+            self._to_sinks(when, status, "ERR", door_name, reader)
+        return size
+
+    def _to_sinks(self, when: float, status: str, status_code: str, door_name: str, reader: str):
+        for sink in self.sinks:
+            try:
+                sink.add(when, status, status_code, reader)
+            except OSError as e:
+                console.print(f"[red]Could not write to {sink.path}: {e}[/]")
+
+    def _format(self, when: float, status: str, status_code: str, door_name: str, reader: str) -> str:
+        second = int(when)
+        if second != self.second:
+            # Bursts of entries share a second, so the timestamp is formatted once per second
+            self.second = second
+            self.timestamp = datetime.fromtimestamp(second).strftime("%Y-%m-%d %H:%M:%S")
+        door_tag = f" [{door_name}]" if door_name else ""
+        return f"[{self.timestamp}]{door_tag} Status: {status} (Code: {status_code})\n"
+
+    def _run(self):
+        buffer = []
+        size = 0
+        flush_at = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                item = self.queue.get(timeout=max(0.0, flush_at - time.monotonic()))
+            except queue.Empty:
+                item = None
+            if item is self.STOP:
+                self._add_summaries(buffer, float("inf"))
+                self._flush(buffer)
+                self._flush_sinks()
+                return
+            if item is not None and item[0] is self.CARD:
+                for sink in self.card_sinks:
+                    sink.add_card(*item[1:])
+            elif item is not None:
+                entry = self._format(*item)
+                buffer.append(entry)
+                size += len(entry)
+                self._to_sinks(*item)
+            now = time.monotonic()
+            if size >= self.flush_bytes or now >= flush_at:
+                size += self._add_summaries(buffer, now)
+                self._flush(buffer)
+                self._flush_sinks()
+                buffer = []
+                size = 0
+                flush_at = now + self.flush_interval
+
+    def _flush(self, buffer: list):
+        if not buffer:
+            return
+        data = "".join(buffer)
+        try:
+            if self._should_rotate(len(data)):
+                self._rotate()
+            self.file.write(data)
+            self.file.flush()
+        except OSError as e:
+            console.print(f"[red]Could not write {self.path}: {e}[/]")
+            return
+        self.size += len(data)
+        self.written += len(buffer)
+        self.flushes += 1
+
+    def _flush_sinks(self):
+        for sink in self.sinks:
+            try:
+                sink.flush()
+            except OSError as e:
+                console.print(f"[red]Could not write to {sink.path}: {e}[/]")
+
+    def _should_rotate(self, incoming: int) -> bool:
+        if not self.size:
+            return False
+        if self.rotate == "size":
+            return self.size + incoming > self.max_bytes
+        if self.rotate == "daily":
+            return datetime.now().date() != self.day
+        return False
+
+    def _rotate(self):
+        """Compress the current segment, start a new one and prune old segments."""
+        self.file.close()
+        rotated = f"{self.path}.{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}"
+        os.replace(self.path, rotated)
+        self._open()
+        with open(rotated, "rb") as src, gzip.open(rotated + ".gz", "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.remove(rotated)
+        self.rotations += 1
+
+        segments = sorted(glob.glob(glob.escape(self.path) + ".*.gz"))
+        for old in segments[:max(0, len(segments) - self.backups)]:
+            os.remove(old)
+
+    def stop(self, timeout: float = 5.0):
+        """Write out everything queued and close the file."""
+        with self.lock:
+            thread, self.thread = self.thread, None
+        if thread is None:
+            return
+        self.queue.put(self.STOP)
+        thread.join(timeout)
+        self.file.close()
+        for sink in self.sinks:
+            try:
+                sink.close()
+            except OSError as e:
+                console.print(f"[red]Could not write to {sink.path}: {e}[/]")
+        self.sinks = []
+        self.card_sinks = []
+
+log_writer = LogWriter()
 
-def log_status(status: str, status_code: str):
-    """Log status to file."""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    log_entry = f"[{timestamp}] Status: {status} (Code: {status_code})"
-    with open(LOG_FILE, 'a') as f:
-        f.write(log_entry + '\n')
+def log_status(status: str, status_code: str, door: DoorReader = None):
+    """Log status to file; the door is tagged in the text line only when several are monitored."""
+    if door is None:
+        log_writer.log(status, status_code)
+    else:
+        log_writer.log(status, status_code, door_label(door), door.name)
 
 def clear_console():
     """Clear the console."""
     os.system('cls' if os.name == 'nt' else 'clear')
 
 if __name__ == "__main__":
-    continuous_check()
+    if "--async" in sys.argv:
+        async_continuous_check()
+    else:
+        continuous_check()